@@ -1,7 +1,30 @@
+import os
 import re
 import sys
+import mmap
 import time
-from collections import defaultdict
+import heapq
+import glob
+import codecs
+import argparse
+from collections import Counter
+from operator import itemgetter
+
+from prefix_index import PrefixIndex, index_path_for, save_index
+
+CHUNK_SIZE = 16 * 1024 * 1024
+READ_HINT = 1024 * 1024
+_WHITESPACE_BYTES = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f]')
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+
+# Équivalents octets de tokenize pour l'ASCII : minuscules, blancs
+# \x1c-\x1f ramenés à l'espace (bytes.split les ignore) et suppression des
+# caractères ni \w ni \s.
+_ASCII_LOWER_TABLE = bytes.maketrans(
+    bytes(range(ord('A'), ord('Z') + 1)) + b'\x1c\x1d\x1e\x1f',
+    bytes(range(ord('a'), ord('z') + 1)) + b'    '
+)
+_ASCII_PUNCTUATION = bytes(c for c in range(128) if _PUNCTUATION.match(chr(c)))
 
 def clean_word(word):
     """Nettoie un mot : minuscules et suppression de la ponctuation"""
@@ -9,92 +32,804 @@ def clean_word(word):
     word = re.sub(r'[^\w\s]', '', word)
     return word.strip()
 
-def word_count_sequential(file_path):
+def tokenize(text):
+    """
+    Découpe un bloc de texte (ligne ou tampon) en mots nettoyés
+    
+    Équivaut à appliquer clean_word à chaque mot de text.split() en
+    écartant les mots vides, mais en un seul passage de l'expression
+    régulière précompilée sur tout le bloc.
+    
+    Returns:
+        list: Liste des mots nettoyés
+    """
+    return _PUNCTUATION.sub('', text.lower()).split()
+
+def word_count_sequential(file_path, tokenizer=tokenize):
     """
     Compte les mots dans un fichier de manière séquentielle
     
     Args:
         file_path: Chemin vers le fichier texte
+        tokenizer: Découpage d'un bloc en mots (défaut: tokenize ; voir normalize)
     
     Returns:
         dict: Dictionnaire {mot: fréquence}
         int: Nombre total de mots
         float: Temps d'exécution en secondes
     """
-    word_freq = defaultdict(int)
+    word_freq = Counter()
     total_words = 0
     
     start_time = time.time()
     
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            for line in file:
-                words = line.split()
-                for word in words:
-                    cleaned_word = clean_word(word)
-                    if cleaned_word:
-                        word_freq[cleaned_word] += 1
-                        total_words += 1
+            for lines in iter(lambda: file.readlines(READ_HINT), []):
+                words = tokenizer(''.join(lines))
+                word_freq.update(words)
+                total_words += len(words)
+    
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
+
+def read_chunks(file_obj, chunk_size=READ_HINT):
+    """Lit un flux (texte ou binaire) par blocs de taille bornée"""
+    return iter(lambda: file_obj.read(chunk_size), file_obj.read(0))
+
+def iter_word_blocks(chunks, tokenizer=tokenize):
+    """
+    Transforme un flux de blocs (str ou bytes UTF-8) en listes de mots nettoyés
+    
+    Les blocs peuvent être coupés n'importe où : le dernier mot incomplet
+    d'un bloc est reporté sur le suivant et les octets sont décodés de
+    manière incrémentale. La mémoire reste bornée par la taille d'un bloc.
+    
+    Yields:
+        list: Mots nettoyés d'un bloc
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = ''
+    
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = decoder.decode(chunk)
+        text = carry + chunk
+        if not text:
+            continue
+        if text[-1].isspace():
+            carry = ''
+        else:
+            parts = text.rsplit(None, 1)
+            text, carry = parts if len(parts) == 2 else ('', parts[0])
+        yield tokenizer(text)
+    
+    yield tokenizer(carry + decoder.decode(b'', final=True))
+
+def count_stream(chunks, tokenizer=tokenize):
+    """
+    Compte les mots d'un flux de blocs (str ou bytes UTF-8)
+    
+    Args:
+        chunks: Itérable de blocs, par ex. read_chunks(sys.stdin.buffer)
+        tokenizer: Découpage d'un bloc en mots
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence}
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    word_freq = Counter()
+    total_words = 0
+    
+    start_time = time.time()
+    
+    for words in iter_word_blocks(chunks, tokenizer):
+        word_freq.update(words)
+        total_words += len(words)
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
+
+def _chunk_offsets(file_path, n_chunks):
+    """
+    Découpe un fichier en plages d'octets alignées sur des blancs
+    
+    Une coupure tombe toujours sur un octet blanc ASCII : aucun mot (ni
+    caractère UTF-8 multi-octets) n'est donc coupé entre deux plages.
+    
+    Returns:
+        list: Liste de tuples (début, fin) en octets
+    """
+    size = os.path.getsize(file_path)
+    offsets = [0]
+    
+    with open(file_path, 'rb') as f:
+        for i in range(1, n_chunks):
+            pos = max(size * i // n_chunks, offsets[-1])
+            f.seek(pos)
+            while True:
+                block = f.read(64 * 1024)
+                if not block:
+                    pos = size
+                    break
+                match = _WHITESPACE_BYTES.search(block)
+                if match:
+                    pos += match.start()
+                    break
+                pos += len(block)
+            if pos > offsets[-1]:
+                offsets.append(pos)
+    
+    if size > offsets[-1]:
+        offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+def _count_chunk(task):
+    """Compte les mots d'une plage d'octets (exécuté dans un processus fils)"""
+    file_path, start, end, tokenizer = task
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        words = tokenizer(f.read(end - start).decode('utf-8'))
+    
+    return Counter(words), len(words)
+
+def word_count_mmap(file_path):
+    """
+    Compte les mots d'un fichier projeté en mémoire, directement sur les octets
+    
+    Le fichier est parcouru par fenêtres de CHUNK_SIZE octets alignées sur
+    des blancs ; chaque fenêtre passe par une table de traduction d'octets
+    (minuscules + suppression de la ponctuation ASCII) puis bytes.split.
+    Seules les clés uniques sont décodées à la fin. Les fenêtres contenant
+    des octets non ASCII ne sont que mises en minuscules (la ponctuation
+    influence str.lower, ex. sigma final) et leurs clés repassent par
+    tokenize : le résultat reste identique à word_count_sequential.
+    
+    Args:
+        file_path: Chemin vers le fichier texte
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence}
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    byte_freq = Counter()
+    raw_freq = Counter()
+    
+    start_time = time.time()
+    
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start = 0
+                    while start < size:
+                        match = _WHITESPACE_BYTES.search(mm, min(start + CHUNK_SIZE, size))
+                        end = match.start() + 1 if match else size
+                        block = mm[start:end]
+                        if block.isascii():
+                            block = block.translate(_ASCII_LOWER_TABLE, _ASCII_PUNCTUATION)
+                            byte_freq.update(block.split())
+                        else:
+                            raw_freq.update(block.translate(_ASCII_LOWER_TABLE).split())
+                        start = end
     
     except FileNotFoundError:
         print(f"Erreur: Fichier {file_path} non trouvé")
         return {}, 0, 0
     
+    word_freq = Counter({key.decode('ascii'): freq for key, freq in byte_freq.items()})
+    total_words = sum(byte_freq.values())
+    for key, freq in raw_freq.items():
+        for word in tokenize(key.decode('utf-8')):
+            word_freq[word] += freq
+            total_words += freq
+    
     end_time = time.time()
     execution_time = end_time - start_time
     
-    return dict(word_freq), total_words, execution_time
+    return word_freq, total_words, execution_time
 
-def print_top_words(word_freq, n=10):
-    """Affiche les n mots les plus fréquents"""
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+def word_count_parallel(file_path, workers=None, tokenizer=tokenize):
+    """
+    Compte les mots d'un fichier en parallèle (map/reduce multi-cœurs)
+    
+    Le fichier est découpé en plages d'octets alignées sur des blancs,
+    chaque plage est comptée dans un pool de processus puis les
+    dictionnaires partiels sont fusionnés. Le résultat est identique à
+    celui de word_count_sequential.
+    
+    Args:
+        file_path: Chemin vers le fichier texte
+        workers: Nombre de processus (défaut: nombre de cœurs)
+        tokenizer: Découpage d'un bloc en mots (transmis aux processus fils)
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence}
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    start_time = time.time()
+    
+    try:
+        size = os.path.getsize(file_path)
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    
+    n_chunks = max(workers, -(-size // CHUNK_SIZE))
+    tasks = [(file_path, start, end, tokenizer) for start, end in _chunk_offsets(file_path, n_chunks)]
+    
+    word_freq = Counter()
+    total_words = 0
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial_freq, partial_total in executor.map(_count_chunk, tasks):
+            word_freq.update(partial_freq)
+            total_words += partial_total
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
+
+def is_batch_input(spec):
+    """
+    Indique si l'entrée désigne plusieurs fichiers (dossier ou motif glob)
+    
+    Un fichier existant reste un fichier, même si son nom contient des
+    caractères de motif (ex: x[1].txt).
+    """
+    return not os.path.isfile(spec) and (os.path.isdir(spec) or glob.has_magic(spec))
+
+def expand_inputs(spec):
+    """
+    Liste les fichiers désignés par un dossier (parcouru récursivement),
+    un motif glob (** accepté) ou un simple chemin
+    
+    Returns:
+        list: Chemins des fichiers, triés
+    """
+    if os.path.isdir(spec):
+        return sorted(os.path.join(root, name)
+                      for root, _, names in os.walk(spec)
+                      for name in names)
+    if is_batch_input(spec):
+        return sorted(path for path in glob.glob(spec, recursive=True) if os.path.isfile(path))
+    return [spec]
+
+def _count_file(file_path):
+    """Compte un fichier entier (exécuté dans un processus fils du mode lot)"""
+    from compressed_input import compression_format, word_count_compressed
+    if compression_format(file_path):
+        word_freq, total_words, _ = word_count_compressed(file_path)
+    else:
+        word_freq, total_words, _ = word_count_sequential(file_path)
+    return word_freq, total_words
+
+def _count_batch_file(file_path):
+    """Compte un fichier du mode lot ; un fichier illisible est signalé au lieu d'interrompre le lot"""
+    import lzma
+    import zlib
+    try:
+        word_freq, total_words = _count_file(file_path)
+    except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError) as e:
+        return Counter(), 0, f"{type(e).__name__}: {e}"
+    return word_freq, total_words, None
+
+def word_count_batch(file_paths, workers=None):
+    """
+    Compte de nombreux fichiers dans un même processus maître
+    
+    Les fichiers sont répartis par paquets sur un pool de processus : on ne
+    paie qu'une fois le démarrage de l'interpréteur et les imports. Un
+    fichier illisible (binaire, non UTF-8, archive corrompue) est écarté
+    du total et signalé, sans interrompre le lot.
+    
+    Args:
+        file_paths: Liste des fichiers à compter
+        workers: Nombre de processus (défaut: nombre de cœurs)
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence} agrégé
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+        list: Tuples (fichier, nombre de mots, nombre de mots uniques,
+            erreur ou None)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    
+    word_freq = Counter()
+    total_words = 0
+    per_file = []
+    
+    start_time = time.time()
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_count_batch_file, file_paths, chunksize=chunksize)
+        for file_path, (file_freq, file_total, error) in zip(file_paths, results):
+            word_freq.update(file_freq)
+            total_words += file_total
+            per_file.append((file_path, file_total, len(file_freq), error))
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time, per_file
+
+def top_words(word_freq, n=10):
+    """
+    Sélectionne les n mots les plus fréquents par tas (heapq.nlargest)
+    
+    Coût O(V log n) au lieu du tri complet O(V log V) du vocabulaire ; à
+    fréquence égale l'ordre est le même qu'avec sorted. Counter et
+    CompactCounter font la même sélection dans most_common, ce dernier
+    sans décoder les autres clés.
+    
+    Returns:
+        list: Liste de tuples (mot, fréquence) par fréquence décroissante
+    """
+    if hasattr(word_freq, 'most_common'):
+        return word_freq.most_common(n)
+    return heapq.nlargest(n, word_freq.items(), key=itemgetter(1))
+
+def print_top_words(word_freq, n=10, top=None):
+    """Affiche les n mots les plus fréquents (top: sélection déjà calculée)"""
+    if top is None:
+        top = top_words(word_freq, n)
     print(f"\nTop {n} mots les plus fréquents:")
     print("-" * 30)
-    for word, freq in sorted_words[:n]:
+    for word, freq in top[:n]:
         print(f"{word:20} : {freq:6}")
 
-def main():
-    """Fonction principale"""
-    if len(sys.argv) != 2:
-        print("Usage: python word_count.py <fichier_texte>")
-        sys.exit(1)
+def merge_main(argv):
+    """Sous-commande merge : fusionne des fichiers de comptes .wcb"""
+    from count_format import merge_count_files, iter_count_file
+    
+    parser = argparse.ArgumentParser(
+        prog="WordCount.py merge",
+        description="Fusionne (somme) des fichiers de comptes .wcb en flux"
+    )
+    parser.add_argument('output', help='Fichier .wcb produit')
+    parser.add_argument('inputs', nargs='+', help='Fichiers .wcb à fusionner')
+    parser.add_argument('--top', type=int, default=20,
+                       help='Nombre de mots les plus fréquents à afficher (défaut: 20)')
+    
+    args = parser.parse_args(argv)
+    
+    start_time = time.time()
+    total_words, unique_words = merge_count_files(args.output, args.inputs)
+    exec_time = time.time() - start_time
+    
+    print(f"Fusion de {len(args.inputs)} fichiers dans: {args.output}")
+    print("=" * 50)
+    print(f"Temps d'exécution: {exec_time:.4f} secondes")
+    print(f"Nombre total de mots: {total_words:,}")
+    print(f"Nombre de mots uniques: {unique_words:,}")
+    
+    top = heapq.nlargest(args.top, iter_count_file(args.output), key=itemgetter(1))
+    print_top_words(None, args.top, top)
+
+def query_main(argv):
+    """Sous-commande query : interroge une table .wcb via son index, sans retri"""
+    parser = argparse.ArgumentParser(
+        prog="WordCount.py query",
+        description="Interroge une table de comptes .wcb (mot, préfixe, intervalle, top-K)"
+    )
+    parser.add_argument('counts', help='Fichier .wcb (son index .wcx est lu s\'il existe)')
+    parser.add_argument('--word', type=str, help='Fréquence d\'un mot')
+    parser.add_argument('--prefix', type=str, default='',
+                       help='Restreint aux mots commençant par ce préfixe')
+    parser.add_argument('--range', nargs=2, metavar=('DEBUT', 'FIN'),
+                       help='Mots w tels que DEBUT <= w < FIN, par ordre alphabétique')
+    parser.add_argument('--limit', type=int, default=50,
+                       help='Nombre maximal de mots listés par --prefix ou --range (défaut: 50)')
+    parser.add_argument('--top', type=int,
+                       help='Les N mots les plus fréquents (parmi ceux du préfixe)')
+    
+    args = parser.parse_args(argv)
+    if args.limit < 0 or (args.top is not None and args.top < 0):
+        parser.error("--limit et --top doivent être positifs ou nuls")
+    
+    start_time = time.time()
+    index = PrefixIndex.load(args.counts)
+    print(f"Index chargé: {len(index):,} mots en {time.time() - start_time:.4f} secondes")
+    
+    if args.word is not None:
+        print(f"{args.word:20} : {index.get(args.word):6}")
+    elif args.range:
+        for word, freq in index.range(args.range[0], args.range[1], args.limit):
+            print(f"{word:20} : {freq:6}")
+    elif args.top is not None:
+        print_top_words(None, args.top, index.top(args.top, args.prefix))
+    else:
+        for word, freq in index.prefix(args.prefix, args.limit):
+            print(f"{word:20} : {freq:6}")
+
+def main(argv=None):
+    """Fonction principale (argv: arguments sans le nom du programme)"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['merge']:
+        merge_main(argv[1:])
+        return
+    if argv[:1] == ['query']:
+        query_main(argv[1:])
+        return
+    
+    from compressed_input import compression_format, word_count_compressed
+    
+    parser = argparse.ArgumentParser(
+        description="Comptage de mots dans un fichier texte",
+        epilog="Fusion de résultats: python WordCount.py merge <sortie.wcb> <entrée.wcb>...\n"
+               "Requêtes sur un résultat (compté avec --index): python WordCount.py query <comptes.wcb> [--prefix P] [--top N]",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('file', help='Fichier texte à analyser (- pour l\'entrée standard, '
+                                     'dossier ou motif glob pour un lot de fichiers)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Nombre de processus pour le comptage parallèle (défaut: 1, séquentiel)')
+    parser.add_argument('--mmap', action='store_true',
+                       help='Compte directement sur les octets d\'un fichier projeté en mémoire')
+    parser.add_argument('--compact', action='store_true',
+                       help='Stockage compact des mots (arène d\'octets + tableaux) pour les grands vocabulaires')
+    parser.add_argument('--approx', action='store_true',
+                       help='Comptage approximatif en mémoire bornée (Count-Min Sketch + Space-Saving)')
+    parser.add_argument('--approx-memory', type=float, default=16,
+                       help='Plafond mémoire du mode --approx en Mo (défaut: 16)')
+    parser.add_argument('--external', action='store_true',
+                       help='Comptage hors mémoire : déversement sur disque et fusion k-voies')
+    parser.add_argument('--max-keys', type=int, default=1_000_000,
+                       help='Nombre maximal de mots distincts en mémoire du mode --external (défaut: 1000000)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Ne compte que la fin ajoutée depuis la dernière exécution (journaux en ajout seul)')
+    parser.add_argument('--state', type=str,
+                       help='Fichier d\'état du mode --incremental (défaut: results/state/<fichier>-<hash>.state)')
+    parser.add_argument('--cache', action='store_true',
+                       help='Réutilise le résultat d\'un fichier inchangé (cache dans results/cache)')
+    parser.add_argument('--cache-hash', action='store_true',
+                       help='Ajoute une empreinte rapide du contenu à la clé de cache')
+    parser.add_argument('--cache-max-mb', type=float, default=512,
+                       help='Taille maximale du cache en Mo (défaut: 512)')
+    parser.add_argument('--normalize', action='store_true',
+                       help='Normalise les mots (NFKC + casefold) : formes composées/décomposées confondues')
+    parser.add_argument('--stopwords', type=str, metavar='LISTE',
+                       help='Écarte les mots vides (\'fr\' ou fichier de mots) ; implique --normalize')
+    parser.add_argument('--ngram', type=int, default=1, metavar='N',
+                       help='Compte les n-grammes de N mots consécutifs (défaut: 1, mots seuls)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Comptage séquentiel instrumenté : temps par phase et progression (Mo/s, mots/s)')
+    parser.add_argument('--progress-interval', type=float, default=1.0,
+                       help='Secondes entre deux lignes de progression du mode --profile (défaut: 1)')
+    parser.add_argument('--profile-out', type=str,
+                       help='Écrit un profil cProfile du comptage exact et du top-K (lisible par pstats)')
+    parser.add_argument('--top', type=int, default=20,
+                       help='Nombre de mots les plus fréquents à afficher et sauvegarder (défaut: 20)')
+    parser.add_argument('--save-counts', action='store_true',
+                       help='Sauvegarde aussi la table de fréquences complète (.wcb, fusionnable)')
+    parser.add_argument('--index', action='store_true',
+                       help='Sauvegarde la table complète et son index de requêtes (.wcx) ; implique --save-counts')
+    
+    args = parser.parse_args(argv)
+    file_path = args.file
+    
+    if args.ngram < 1:
+        parser.error("--ngram doit être au moins 1")
+    if args.stopwords:
+        args.normalize = True
+    if args.ngram > 1 or args.normalize:
+        unsupported = [option for option, enabled in (('--mmap', args.mmap), ('--incremental', args.incremental),
+                                                      ('--profile', args.profile),
+                                                      ('lot de fichiers', is_batch_input(file_path)))
+                       if enabled]
+        if args.normalize:
+            # Les moteurs en flux comptent les n-grammes, pas les mots normalisés
+            unsupported += [option for option, enabled in (('--approx', args.approx), ('--external', args.external),
+                                                           ('--compact', args.compact))
+                            if enabled]
+        if args.ngram > 1 and args.normalize:
+            unsupported.append('--normalize')
+        if unsupported:
+            feature = '--ngram' if args.ngram > 1 else '--normalize'
+            parser.error(f"{feature} n'est pas disponible avec: {', '.join(unsupported)}")
+    
+    file_paths = None
+    if is_batch_input(file_path):
+        # Le mode lot compte chaque fichier en entier, avec le moteur par défaut
+        unsupported = [option for option, enabled in (('--approx', args.approx), ('--external', args.external),
+                                                      ('--mmap', args.mmap), ('--compact', args.compact),
+                                                      ('--incremental', args.incremental),
+                                                      ('--profile', args.profile))
+                       if enabled]
+        if unsupported:
+            parser.error(f"un lot de fichiers n'est pas disponible avec: {', '.join(unsupported)}")
+        file_paths = expand_inputs(file_path)
+        if not file_paths:
+            parser.error(f"aucun fichier ne correspond à: {file_path}")
+    elif file_path == '-':
+        # L'entrée standard est comptée en flux par count_stream (ou word_count_ngram)
+        unsupported = [option for option, enabled in (('--mmap', args.mmap), ('--compact', args.compact),
+                                                      ('--incremental', args.incremental),
+                                                      ('--profile', args.profile))
+                       if enabled]
+        if unsupported:
+            parser.error(f"l'entrée standard n'est pas disponible avec: {', '.join(unsupported)}")
+    elif compression_format(file_path):
+        # Ces modes lisent les octets du fichier lui-même (projection, décalages, lecture instrumentée)
+        unsupported = [option for option, enabled in (('--mmap', args.mmap), ('--incremental', args.incremental),
+                                                      ('--profile', args.profile))
+                       if enabled]
+        if unsupported:
+            parser.error(f"un fichier compressé n'est pas disponible avec: {', '.join(unsupported)}")
     
-    file_path = sys.argv[1]
+    tokenizer = tokenize
+    if args.normalize:
+        from normalize import Normalizer, load_stopwords
+        tokenizer = Normalizer(load_stopwords(args.stopwords) if args.stopwords else ())
     
     print(f"Analyse du fichier: {file_path}")
     print("=" * 50)
+    if args.normalize:
+        print(f"Normalisation: NFKC + casefold, {len(tokenizer.stopwords)} mots vides écartés")
+    unit = "mots" if args.ngram == 1 else f"{args.ngram}-grammes"
     
-    word_freq, total_words, exec_time = word_count_sequential(file_path)
+    if args.approx:
+        from approx_count import word_count_approx, print_approx_top
+        print(f"Mode approximatif: {args.approx_memory:g} Mo")
+        if args.ngram > 1:
+            print(f"Mode {args.ngram}-grammes")
+        counter, total_words, exec_time = word_count_approx(file_path, args.approx_memory, args.ngram)
+        print(f"Temps d'exécution: {exec_time:.4f} secondes")
+        print(f"Nombre total de {unit}: {total_words:,}")
+        print_approx_top(counter, args.top)
+        return
+    
+    if args.external:
+        from external_count import word_count_external
+        from count_format import iter_count_file
+        output_file = results_path(file_path, args.ngram, '.wcb')
+        print(f"Mode hors mémoire: {args.max_keys:,} {unit} distincts en mémoire au plus")
+        total_words, unique_words, exec_time = word_count_external(file_path, output_file, args.max_keys,
+                                                                   ngram=args.ngram)
+        print(f"Temps d'exécution: {exec_time:.4f} secondes")
+        print(f"Nombre total de {unit}: {total_words:,}")
+        print(f"Nombre de {unit} uniques: {unique_words:,}")
+        if total_words:
+            top = heapq.nlargest(args.top, iter_count_file(output_file), key=itemgetter(1))
+            print_top_words(None, args.top, top)
+            print(f"\nComptes triés sauvegardés dans: {output_file}")
+        return
+    
+    profiler = None
+    if args.profile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    cache = cached = timer = None
+    word_freq = None
+    save_counts, index = args.save_counts, args.index
+    if args.cache and not args.incremental and os.path.isfile(file_path):
+        from result_cache import ResultCache, cache_key
+        start_time = time.time()
+        cache = ResultCache(max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        options = []
+        if args.ngram > 1:
+            options.append(('ngram', args.ngram))
+        if args.normalize:
+            options.append(('normalize', tuple(sorted(tokenizer.stopwords))))
+        key = cache_key(file_path, options, args.cache_hash)
+        # Le top et les totaux suffisent, sauf pour réécrire la table complète
+        cached = cache.get_top(key, args.top)
+    
+    if cached:
+        top, unique_words, total_words = cached
+        print("Résultat chargé depuis le cache")
+        if save_counts or index:
+            counts_file = results_path(file_path, args.ngram, '.wcb', args.normalize)
+            if _counts_up_to_date(counts_file, key, index):
+                print(f"Table de fréquences déjà à jour: {counts_file}")
+                save_counts = index = False
+            else:
+                word_freq, _ = cache.get(key)
+        exec_time = time.time() - start_time
+    elif args.ngram > 1:
+        from ngram_count import word_count_ngram, word_count_ngram_parallel
+        if args.workers > 1 and file_path != '-' and not compression_format(file_path):
+            print(f"Mode {args.ngram}-grammes: {args.workers} processus")
+            word_freq, total_words, exec_time = word_count_ngram_parallel(file_path, args.ngram, args.workers)
+        elif args.compact:
+            from compact_counter import word_count_compact
+            print(f"Mode {args.ngram}-grammes compact: n-grammes internés dans une arène d'octets")
+            word_freq, total_words, exec_time = word_count_compact(file_path, args.ngram)
+        else:
+            print(f"Mode {args.ngram}-grammes")
+            word_freq, total_words, exec_time = word_count_ngram(file_path, args.ngram)
+    elif file_path == '-':
+        word_freq, total_words, exec_time = count_stream(read_chunks(sys.stdin.buffer), tokenizer)
+    elif file_paths is not None:
+        workers = args.workers if args.workers > 1 else os.cpu_count()
+        print(f"Mode lot: {len(file_paths):,} fichiers, {workers} processus")
+        word_freq, total_words, exec_time, per_file = word_count_batch(file_paths, workers)
+        print(f"\n{'Fichier':<40} {'Mots':>12} {'Uniques':>10}")
+        print("-" * 64)
+        skipped = 0
+        for path, file_total, file_unique, error in per_file:
+            if error:
+                skipped += 1
+                print(f"{path:<40} ignoré ({error})")
+            else:
+                print(f"{path:<40} {file_total:>12,} {file_unique:>10,}")
+        print("-" * 64)
+        if skipped:
+            print(f"{skipped:,} fichier(s) illisible(s) ignoré(s)")
+        print("Total agrégé:")
+    elif compression_format(file_path):
+        print(f"Fichier compressé ({compression_format(file_path)}): décompression en flux")
+        if args.compact and args.workers <= 1:
+            from compact_counter import word_count_compact
+            print("Mode compact: mots internés dans une arène d'octets")
+            word_freq, total_words, exec_time = word_count_compact(file_path)
+        else:
+            word_freq, total_words, exec_time = word_count_compressed(file_path, args.workers, tokenizer)
+    elif args.incremental:
+        from incremental_count import word_count_incremental
+        print("Mode incrémental")
+        word_freq, total_words, exec_time = word_count_incremental(file_path, args.state)
+    elif args.profile:
+        from profiling import PhaseTimer, word_count_profiled
+        print("Mode instrumenté: comptage séquentiel phase par phase")
+        timer = PhaseTimer(args.progress_interval, os.path.getsize(file_path) if os.path.isfile(file_path) else None)
+        word_freq, total_words, exec_time = word_count_profiled(file_path, timer)
+    elif args.workers > 1:
+        print(f"Mode parallèle: {args.workers} processus")
+        word_freq, total_words, exec_time = word_count_parallel(file_path, args.workers, tokenizer)
+    elif args.compact:
+        from compact_counter import word_count_compact
+        print("Mode compact: mots internés dans une arène d'octets")
+        word_freq, total_words, exec_time = word_count_compact(file_path)
+    elif args.mmap:
+        print("Mode mmap: comptage sur les octets")
+        word_freq, total_words, exec_time = word_count_mmap(file_path)
+    else:
+        word_freq, total_words, exec_time = word_count_sequential(file_path, tokenizer)
+    
+    if cache and not cached:
+        cache.put(key, word_freq, total_words)
+    if not cached:
+        unique_words = len(word_freq)
     
     print(f"Temps d'exécution: {exec_time:.4f} secondes")
-    print(f"Nombre total de mots: {total_words:,}")
-    print(f"Nombre de mots uniques: {len(word_freq):,}")
+    print(f"Nombre total de {unit}: {total_words:,}")
+    print(f"Nombre de {unit} uniques: {unique_words:,}")
     
-    print_top_words(word_freq)
+    if timer:
+        with timer.phase('top_k'):
+            top = top_words(word_freq, args.top)
+        timer.report()
+    elif not cached:
+        top = top_words(word_freq, args.top)
     
-    save_results(word_freq, total_words, exec_time, file_path)
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile_out)
+        print(f"Profil cProfile écrit dans: {args.profile_out} (python -m pstats {args.profile_out})")
+    
+    print_top_words(word_freq, args.top, top)
+    
+    save_results(word_freq, total_words, exec_time, file_path, top, args.ngram,
+                 save_counts, index, unique_words, args.normalize, key if cache else None)
+
+def results_path(file_path, ngram=1, extension='.txt', normalize=False):
+    """Fichier de résultats d'une entrée : results/wordcount_<nom>[_<n>grammes][_norm]<extension>"""
+    if file_path == '-':
+        name = "stdin"
+    elif is_batch_input(file_path) and not os.path.isdir(file_path):
+        name = "lot"
+    else:
+        name = os.path.basename(os.path.normpath(file_path))
+    if ngram > 1:
+        name += f"_{ngram}grammes"
+    if normalize:
+        name += "_norm"
+    return os.path.join("results", f"wordcount_{name}{extension}")
 
-def save_results(word_freq, total_words, exec_time, file_path):
-    """Sauvegarde les résultats dans un fichier"""
-    import os
-    results_dir = "results"
-    os.makedirs(results_dir, exist_ok=True)
+def _source_key_path(counts_file):
+    """Fichier voisin d'une table .wcb : clé de cache du résultat qu'elle contient"""
+    return counts_file + ".key"
+
+def _counts_up_to_date(counts_file, key, index):
+    """
+    Indique si la table .wcb (et son .wcx si index) contient le résultat de la clé de cache key
     
-    output_file = os.path.join(results_dir, f"wordcount_{os.path.basename(file_path)}.txt")
+    La clé est relue dans le fichier voisin écrit avec la table ; une table
+    réécrite depuis (autre entrée de même nom, autres options) le rend périmé.
+    """
+    key_file = _source_key_path(counts_file)
+    try:
+        counts_time = os.path.getmtime(counts_file)
+        if os.path.getmtime(key_file) < counts_time:
+            return False
+        if index and os.path.getmtime(index_path_for(counts_file)) < counts_time:
+            return False
+        with open(key_file, 'r', encoding='ascii') as f:
+            return f.read() == key
+    except (FileNotFoundError, UnicodeDecodeError):
+        return False
+
+def save_results(word_freq, total_words, exec_time, file_path, top=None, ngram=1,
+                 save_counts=False, index=False, unique_words=None, normalize=False, source_key=None):
+    """
+    Sauvegarde les résultats : résumé lisible (.txt) et, sur demande, table
+    de fréquences complète au format fusionnable .wcb (voir count_format)
+    et son index .wcx pour les requêtes (voir prefix_index)
+    
+    Le résumé ne coûte que la sélection du top ; la table complète trie
+    tout le vocabulaire, et l'index le trie une seconde fois par fréquence.
+    
+    Args:
+        top: Sélection des mots les plus fréquents déjà calculée
+        ngram: Taille des n-grammes comptés (suffixe _<n>grammes du nom)
+        save_counts: Écrit la table .wcb
+        index: Écrit la table .wcb et son index .wcx
+        unique_words: Nombre de mots uniques, si word_freq n'est pas fourni
+            (résultat relu du cache sans sa table)
+        normalize: Mots normalisés (suffixe _norm du nom)
+        source_key: Clé de cache du résultat, notée à côté de la table .wcb
+            (voir _counts_up_to_date)
+    """
+    if top is None:
+        top = top_words(word_freq, 20)
+    if unique_words is None:
+        unique_words = len(word_freq)
+    
+    output_file = results_path(file_path, ngram, normalize=normalize)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(f"Fichier analysé: {file_path}\n")
         f.write(f"Temps d'exécution: {exec_time:.4f} secondes\n")
         f.write(f"Nombre total de mots: {total_words}\n")
-        f.write(f"Nombre de mots uniques: {len(word_freq)}\n\n")
+        f.write(f"Nombre de mots uniques: {unique_words}\n\n")
         
-        f.write("Top 20 mots les plus fréquents:\n")
+        f.write(f"Top {len(top)} mots les plus fréquents:\n")
         f.write("-" * 40 + "\n")
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        for word, freq in sorted_words[:20]:
+        for word, freq in top:
             f.write(f"{word:20} : {freq:6}\n")
     
     print(f"\nRésultats détaillés sauvegardés dans: {output_file}")
+    
+    if not (save_counts or index):
+        return
+    counts_file = results_path(file_path, ngram, '.wcb', normalize)
+    if index:
+        save_index(counts_file, word_freq, total_words)
+    else:
+        from count_format import write_count_file
+        write_count_file(counts_file, word_freq, total_words)
+    key_file = _source_key_path(counts_file)
+    if source_key:
+        with open(key_file, 'w', encoding='ascii') as f:
+            f.write(source_key)
+    elif os.path.exists(key_file):
+        os.remove(key_file)
+    print(f"Table de fréquences complète (fusionnable) dans: {counts_file}")
+    if index:
+        print(f"Index des requêtes (préfixe, intervalle, top-K) dans: {index_path_for(counts_file)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Comptage approximatif en mémoire bornée
+
+Count-Min Sketch pour estimer la fréquence de n'importe quel mot et table
+Space-Saving pour suivre les mots les plus fréquents (heavy hitters).
+"""
+
+import math
+import time
+import heapq
+import random
+from array import array
+from collections import Counter
+
+from WordCount import iter_word_blocks
+from compressed_input import iter_input_chunks
+from ngram_count import iter_ngram_blocks
+
+# Estimation de l'occupation d'une entrée Space-Saving (clé str, entrées des
+# deux dictionnaires et tuple du tas)
+SPACE_SAVING_ENTRY_BYTES = 200
+_PRIME = (1 << 61) - 1
+
+class CountMinSketch:
+    """
+    Count-Min Sketch de depth lignes sur width compteurs
+    
+    L'estimation ne sous-estime jamais : fréquence <= estimation <=
+    fréquence + epsilon * N avec probabilité 1 - delta, où
+    epsilon = e / width et delta = e^-depth.
+    """
+    
+    def __init__(self, width, depth=4, seed=0):
+        self.width = max(1, int(width))
+        self.depth = max(1, int(depth))
+        self.total = 0
+        rng = random.Random(seed)
+        self._hashes = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME))
+                        for _ in range(self.depth)]
+        self._rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+    
+    @classmethod
+    def from_memory(cls, memory_bytes, depth=4, seed=0):
+        """Dimensionne le sketch pour occuper environ memory_bytes octets"""
+        return cls(memory_bytes // (8 * depth), depth, seed)
+    
+    @property
+    def epsilon(self):
+        return math.e / self.width
+    
+    @property
+    def delta(self):
+        return math.exp(-self.depth)
+    
+    def _indexes(self, word):
+        h = hash(word)
+        width = self.width
+        return [((a * h + b) % _PRIME) % width for a, b in self._hashes]
+    
+    def add(self, word, count=1):
+        self.total += count
+        for row, index in zip(self._rows, self._indexes(word)):
+            row[index] += count
+    
+    def estimate(self, word):
+        return min(row[index] for row, index in zip(self._rows, self._indexes(word)))
+    
+    def error_bound(self):
+        """Surestimation maximale (epsilon * N) avec probabilité 1 - delta"""
+        return math.ceil(self.epsilon * self.total)
+    
+    def memory_bytes(self):
+        return sum(row.itemsize * len(row) for row in self._rows)
+
+class SpaceSaving:
+    """
+    Table Space-Saving des capacity mots les plus fréquents
+    
+    Quand la table est pleine, le mot de plus petit compteur est remplacé
+    par le nouveau mot, qui hérite de ce compteur comme erreur : pour tout
+    mot suivi, compteur - erreur <= fréquence <= compteur.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self.counts = {}
+        self.errors = {}
+        # Tas (compteur, mot) : un compteur peut y être en retard sur
+        # self.counts, il est alors corrigé au moment de l'éviction.
+        self._heap = []
+    
+    @classmethod
+    def from_memory(cls, memory_bytes):
+        """Dimensionne la table pour occuper environ memory_bytes octets"""
+        return cls(memory_bytes // SPACE_SAVING_ENTRY_BYTES)
+    
+    def __len__(self):
+        return len(self.counts)
+    
+    def add(self, word, count=1):
+        counts = self.counts
+        if word in counts:
+            counts[word] += count
+        elif len(counts) < self.capacity:
+            counts[word] = count
+            self.errors[word] = 0
+            heapq.heappush(self._heap, (count, word))
+        else:
+            heap = self._heap
+            while True:
+                min_count, min_word = heap[0]
+                current = counts[min_word]
+                if current == min_count:
+                    break
+                heapq.heapreplace(heap, (current, min_word))
+            del counts[min_word]
+            del self.errors[min_word]
+            counts[word] = min_count + count
+            self.errors[word] = min_count
+            heapq.heapreplace(heap, (min_count + count, word))
+    
+    def top(self, n):
+        """Retourne les n mots suivis de plus grand compteur : (mot, compteur, erreur)"""
+        best = heapq.nlargest(n, self.counts.items(), key=lambda x: x[1])
+        return [(word, count, self.errors[word]) for word, count in best]
+    
+    def memory_bytes(self):
+        return len(self.counts) * SPACE_SAVING_ENTRY_BYTES
+
+class ApproxWordCounter:
+    """Combine un Count-Min Sketch et une table Space-Saving sous un plafond mémoire"""
+    
+    def __init__(self, memory_mb=16, depth=4, seed=0):
+        budget = int(memory_mb * 1024 * 1024)
+        self.sketch = CountMinSketch.from_memory(budget // 2, depth, seed)
+        self.heavy_hitters = SpaceSaving.from_memory(budget // 2)
+    
+    def update(self, words):
+        """Ajoute une liste de mots (agrégée localement avant d'être insérée)"""
+        sketch_add = self.sketch.add
+        heavy_add = self.heavy_hitters.add
+        for word, count in Counter(words).items():
+            sketch_add(word, count)
+            heavy_add(word, count)
+    
+    def estimate(self, word):
+        """Estimation de la fréquence d'un mot (jamais sous-estimée)"""
+        estimate = self.sketch.estimate(word)
+        if word in self.heavy_hitters.counts:
+            estimate = min(estimate, self.heavy_hitters.counts[word])
+        return estimate
+    
+    def top(self, n=10):
+        """
+        Retourne les n mots les plus fréquents avec leurs bornes
+        
+        Returns:
+            list: Tuples (mot, estimation, borne inférieure)
+        """
+        result = []
+        for word, count, error in self.heavy_hitters.top(n):
+            result.append((word, min(count, self.sketch.estimate(word)), count - error))
+        return result
+    
+    def memory_bytes(self):
+        return self.sketch.memory_bytes() + self.heavy_hitters.memory_bytes()
+
+def word_count_approx(file_path, memory_mb=16, ngram=1):
+    """
+    Compte approximativement les mots d'un fichier en mémoire bornée
+    
+    Args:
+        file_path: Chemin vers le fichier texte, ou '-' pour l'entrée standard
+        memory_mb: Plafond mémoire des structures de comptage en Mo
+        ngram: Compte les n-grammes de ngram mots consécutifs (voir ngram_count)
+    
+    Returns:
+        ApproxWordCounter: Compteur approximatif
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    counter = ApproxWordCounter(memory_mb)
+    total_words = 0
+    
+    start_time = time.time()
+    
+    try:
+        for words in iter_ngram_blocks(iter_word_blocks(iter_input_chunks(file_path)), ngram):
+            counter.update(words)
+            total_words += len(words)
+    
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return ApproxWordCounter(memory_mb), 0, 0
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return counter, total_words, execution_time
+
+def print_approx_top(counter, n=10):
+    """Affiche les n mots les plus fréquents avec leurs bornes d'erreur"""
+    sketch = counter.sketch
+    print(f"\nTop {n} mots les plus fréquents (approximatif):")
+    print("-" * 50)
+    print(f"{'mot':20}   {'estimation':>10}   {'min':>10}")
+    for word, estimate, lower in counter.top(n):
+        print(f"{word:20} : {estimate:10} ≥ {lower:10}")
+    print(f"\nMémoire utilisée: {counter.memory_bytes() / (1024 * 1024):.2f} Mo")
+    print(f"Count-Min Sketch: {sketch.depth} x {sketch.width} compteurs, "
+          f"erreur ≤ {sketch.error_bound():,} avec probabilité {1 - sketch.delta:.1%}")
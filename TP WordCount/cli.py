@@ -0,0 +1,46 @@
+"""
+Point d'entrée unique des outils WordCount
+
+    python cli.py count <fichier> [options]     comptage (WordCount.py, avec merge et query)
+    python cli.py generate [options]            génération de corpus (gen_corpus.py)
+    python cli.py bench [options]               benchmarks (run_bench.py)
+    python cli.py plot                          graphiques (plot_results.py)
+    python cli.py serve [options]               service de requêtes (wordcount_service.py)
+
+Seul le module de la commande demandée est importé : une invocation de
+count ne charge ni numpy, ni pandas, ni matplotlib, ni psutil.
+"""
+
+import sys
+import argparse
+import importlib
+
+# Commande -> module dont main(argv) est appelée
+COMMANDS = {
+    "count": "WordCount",
+    "generate": "gen_corpus",
+    "bench": "run_bench",
+    "plot": "plot_results",
+    "serve": "wordcount_service",
+}
+
+def main(argv=None):
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description=__doc__,
+        epilog="Aide d'une commande: python cli.py <commande> --help",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('command', choices=list(COMMANDS), metavar='commande',
+                        help=', '.join(COMMANDS))
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    
+    args = parser.parse_args(argv)
+    
+    module = importlib.import_module(COMMANDS[args.command])
+    sys.argv[0] = f"cli.py {args.command}"
+    return module.main(args.args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Stockage compact des comptes pour les grands vocabulaires
+
+Les mots sont internés dans une arène d'octets contiguë (UTF-8) et
+identifiés par un entier ; décalages, fréquences et hachages sont rangés
+dans des array et l'index est une table à adressage ouvert d'entiers
+32 bits. Un mot coûte ainsi ~30 octets plus sa longueur, contre ~80
+octets pour une entrée de dict (objet str, entrée de table, objet int).
+"""
+
+import time
+import heapq
+from array import array
+from operator import itemgetter
+from collections import Counter
+
+from WordCount import iter_word_blocks
+from compressed_input import iter_input_chunks
+from ngram_count import iter_ngram_blocks
+
+_EMPTY = -1
+# Mots triés à la fois par l'export trié (clés copiées le temps d'un paquet)
+_SORT_RUN = 64 * 1024
+# Seuls les 32 bits de poids faible du hachage sont conservés (table < 2**31 cases)
+_HASH_MASK = 0xffffffff
+
+class CompactCounter:
+    """
+    Compteur de mots à clés internées, en lecture comme un dict
+    
+    Les mises à jour passent par update() (liste de mots ou dict de
+    fréquences) ; la lecture supporte counter[mot], get, in, len,
+    l'itération, keys(), values() et items().
+    """
+    
+    def __init__(self, capacity=1024):
+        self._arena = bytearray()
+        self._offsets = array('Q', [0])
+        self._counts = array('Q')
+        self._hashes = array('I')
+        size = 8
+        while size < capacity * 2:
+            size *= 2
+        self._table = array('i', [_EMPTY]) * size
+    
+    def __len__(self):
+        return len(self._counts)
+    
+    def _key(self, word_id):
+        return self._arena[self._offsets[word_id]:self._offsets[word_id + 1]]
+    
+    def _find(self, key, h):
+        """Retourne (identifiant ou -1, case de la table)"""
+        table = self._table
+        hashes = self._hashes
+        mask = len(table) - 1
+        i = h & mask
+        while True:
+            word_id = table[i]
+            if word_id == _EMPTY:
+                return _EMPTY, i
+            if hashes[word_id] == h and self._key(word_id) == key:
+                return word_id, i
+            i = (i + 1) & mask
+    
+    def _grow(self):
+        size = len(self._table) * 2
+        mask = size - 1
+        table = array('i', [_EMPTY]) * size
+        for word_id, h in enumerate(self._hashes):
+            i = h & mask
+            while table[i] != _EMPTY:
+                i = (i + 1) & mask
+            table[i] = word_id
+        self._table = table
+    
+    def add(self, word, count=1):
+        """Ajoute count occurrences de word"""
+        key = word.encode('utf-8')
+        h = hash(key) & _HASH_MASK
+        word_id, slot = self._find(key, h)
+        if word_id != _EMPTY:
+            self._counts[word_id] += count
+            return
+        word_id = len(self._counts)
+        self._table[slot] = word_id
+        self._arena += key
+        self._offsets.append(len(self._arena))
+        self._counts.append(count)
+        self._hashes.append(h)
+        if 3 * len(self._counts) > 2 * len(self._table):
+            self._grow()
+    
+    def update(self, words):
+        """Ajoute une liste de mots ou un dict {mot: fréquence}"""
+        if not hasattr(words, 'items'):
+            words = Counter(words)
+        add = self.add
+        for word, count in words.items():
+            add(word, count)
+    
+    def get(self, word, default=None):
+        key = word.encode('utf-8')
+        word_id, _ = self._find(key, hash(key) & _HASH_MASK)
+        return default if word_id == _EMPTY else self._counts[word_id]
+    
+    def __getitem__(self, word):
+        count = self.get(word)
+        if count is None:
+            raise KeyError(word)
+        return count
+    
+    def __contains__(self, word):
+        return self.get(word) is not None
+    
+    def __iter__(self):
+        return self.keys()
+    
+    def keys(self):
+        for word_id in range(len(self._counts)):
+            yield self._key(word_id).decode('utf-8')
+    
+    def values(self):
+        return iter(self._counts)
+    
+    def items(self):
+        return zip(self.keys(), self._counts)
+    
+    def most_common(self, n):
+        """Les n mots les plus fréquents, sans décoder les autres clés"""
+        best = heapq.nlargest(n, enumerate(self._counts), key=itemgetter(1))
+        return [(self._key(word_id).decode('utf-8'), count) for word_id, count in best]
+    
+    def sorted_raw_items(self):
+        """
+        Paires (mot UTF-8, fréquence) par ordre croissant, en flux depuis l'arène
+        
+        Les identifiants sont triés par paquets de _SORT_RUN mots, puis les
+        paquets sont fusionnés : en plus des tableaux, seuls 4 octets par mot
+        et les clés d'un paquet sont alloués, jamais une liste de la taille
+        du vocabulaire.
+        """
+        key = self._key
+        counts = self._counts
+        runs = [array('I', sorted(range(start, min(start + _SORT_RUN, len(counts))), key=key))
+                for start in range(0, len(counts), _SORT_RUN)]
+        
+        def iter_run(run):
+            for word_id in run:
+                yield bytes(key(word_id)), counts[word_id]
+        
+        # Clés uniques : les fréquences ne départagent jamais deux paires
+        return heapq.merge(*map(iter_run, runs))
+    
+    def memory_bytes(self):
+        """Occupation mémoire des tableaux (arène, décalages, comptes, hachages, index)"""
+        return (len(self._arena)
+                + sum(a.itemsize * len(a) for a in (self._offsets, self._counts, self._hashes, self._table)))
+
+def word_count_compact(file_path, ngram=1):
+    """
+    Compte les mots d'un fichier dans un CompactCounter
+    
+    Args:
+        file_path: Chemin vers le fichier texte
+        ngram: Compte les n-grammes de ngram mots consécutifs (voir ngram_count)
+    
+    Returns:
+        CompactCounter: Comptes (lecture comme un dict, sans copie finale)
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    word_freq = CompactCounter()
+    total_words = 0
+    
+    start_time = time.time()
+    
+    try:
+        for words in iter_ngram_blocks(iter_word_blocks(iter_input_chunks(file_path)), ngram):
+            word_freq.update(words)
+            total_words += len(words)
+    
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return CompactCounter(), 0, 0
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
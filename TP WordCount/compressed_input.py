@@ -0,0 +1,264 @@
+"""
+Lecture transparente des corpus compressés (.gz, .bz2, .xz)
+
+La décompression (qui relâche le GIL) tourne dans un thread producteur et
+alimente par une file bornée la tokenisation du thread principal. Les
+fichiers formés de plusieurs flux concaténés (pbzip2, bgzip, xz -T...)
+peuvent être décompressés en parallèle : le fichier est découpé sur des
+débuts de flux, chaque plage est décompressée et comptée par un processus,
+puis les mots coupés aux frontières sont recollés.
+
+WordCount importe ce module à chaque comptage (compression_format) : les
+modules de décompression, de threads et de processus ne sont importés
+qu'à l'usage.
+"""
+
+import os
+import re
+import sys
+import mmap
+import time
+import importlib
+from collections import Counter
+
+from WordCount import CHUNK_SIZE, READ_HINT, count_stream, read_chunks, tokenize
+
+# Extension -> (module d'ouverture, motif d'un début de flux)
+FORMATS = {
+    '.gz': ('gzip', re.compile(rb'\x1f\x8b\x08[\x00-\x1f]')),
+    '.bz2': ('bz2', re.compile(rb'BZh[1-9]1AY&SY')),
+    '.xz': ('lzma', re.compile(rb'\xfd7zXZ\x00')),
+}
+QUEUE_SIZE = 8
+_WHITESPACE = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f]')
+_LAST_WHITESPACE = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f][^ \t\n\r\x0b\x0c\x1c-\x1f]*\Z')
+
+def compression_format(file_path):
+    """Extension de compression reconnue du fichier ('.gz', '.bz2', '.xz') ou None"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return ext if ext in FORMATS else None
+
+def _new_decompressor(ext):
+    """Décompresseur d'un flux du format ext"""
+    if ext == '.gz':
+        import zlib
+        return zlib.decompressobj(wbits=31)
+    if ext == '.bz2':
+        import bz2
+        return bz2.BZ2Decompressor()
+    import lzma
+    return lzma.LZMADecompressor(lzma.FORMAT_XZ)
+
+def iter_decompressed_chunks(file_path, chunk_size=READ_HINT):
+    """
+    Décompresse un fichier dans un thread producteur
+    
+    Yields:
+        bytes: Blocs décompressés, dans l'ordre
+    """
+    import queue
+    import threading
+    
+    module = importlib.import_module(FORMATS[compression_format(file_path)][0])
+    chunks = queue.Queue(maxsize=QUEUE_SIZE)
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            with module.open(file_path, 'rb') as f:
+                while not stop.is_set():
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    chunks.put(chunk)
+        except BaseException as e:
+            chunks.put(e)
+        chunks.put(None)
+    
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+    finally:
+        stop.set()
+        while producer.is_alive():
+            try:
+                chunks.get_nowait()
+            except queue.Empty:
+                producer.join(0.01)
+
+def iter_input_chunks(file_path, chunk_size=READ_HINT):
+    """
+    Blocs d'octets d'un fichier, décompressé à la volée s'il est compressé
+    ('-' : entrée standard)
+    
+    Source commune des moteurs qui lisent en flux (approximatif, hors
+    mémoire, compact) : ils acceptent ainsi aussi les .gz, .bz2 et .xz, et
+    l'entrée standard.
+    
+    Yields:
+        bytes: Blocs du contenu (décompressé), dans l'ordre
+    """
+    if file_path == '-':
+        yield from read_chunks(sys.stdin.buffer, chunk_size)
+    elif compression_format(file_path):
+        yield from iter_decompressed_chunks(file_path, chunk_size)
+    else:
+        with open(file_path, 'rb') as f:
+            yield from read_chunks(f, chunk_size)
+
+def _stream_ranges(file_path, pattern, n_ranges):
+    """Découpe le fichier compressé en plages commençant sur un début de flux"""
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return []
+        offsets = [0]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in range(1, n_ranges):
+                match = pattern.search(mm, max(size * i // n_ranges, offsets[-1] + 1))
+                if not match:
+                    break
+                if match.start() > offsets[-1]:
+                    offsets.append(match.start())
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+def _count_range(task):
+    """
+    Décompresse et compte une plage de flux complets (processus fils)
+    
+    Returns:
+        tuple: (comptes, total, début coupé, fin coupée, plage sans blanc),
+        ou None si la plage ne correspond pas à des flux complets
+    """
+    import zlib
+    import lzma
+    
+    file_path, ext, start, end, tokenizer = task
+    word_freq = Counter()
+    total_words = 0
+    head = None
+    carry = b''
+    
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start
+            decompressor = _new_decompressor(ext)
+            pending = b''
+            while remaining > 0 or pending:
+                if not pending:
+                    pending = f.read(min(READ_HINT, remaining))
+                    remaining -= len(pending)
+                    if not pending:
+                        return None
+                if decompressor.eof:
+                    if ext == '.xz':
+                        pending = pending.lstrip(b'\x00')
+                        if not pending:
+                            continue
+                    decompressor = _new_decompressor(ext)
+                data = decompressor.decompress(pending)
+                pending = decompressor.unused_data if decompressor.eof else b''
+                
+                data = carry + data
+                if head is None:
+                    match = _WHITESPACE.search(data)
+                    if not match:
+                        carry = data
+                        continue
+                    head, data = data[:match.start()], data[match.start():]
+                match = _LAST_WHITESPACE.search(data)
+                if not match:
+                    carry = data
+                    continue
+                carry = data[match.start() + 1:]
+                words = tokenizer(data[:match.start() + 1].decode('utf-8'))
+                word_freq.update(words)
+                total_words += len(words)
+            if not decompressor.eof:
+                return None
+    except (OSError, EOFError, zlib.error, lzma.LZMAError):
+        return None
+    
+    if head is None:
+        return word_freq, total_words, carry, b'', True
+    return word_freq, total_words, head, carry, False
+
+def _count_parallel(file_path, ext, workers, tokenizer=tokenize):
+    """Comptage multi-flux en parallèle ; None si le fichier ne s'y prête pas"""
+    n_ranges = max(workers, -(-os.path.getsize(file_path) // CHUNK_SIZE))
+    ranges = _stream_ranges(file_path, FORMATS[ext][1], n_ranges)
+    if len(ranges) < 2:
+        return None
+    
+    tasks = [(file_path, ext, start, end, tokenizer) for start, end in ranges]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = list(executor.map(_count_range, tasks))
+    if any(partial is None for partial in partials):
+        return None
+    
+    word_freq = Counter()
+    total_words = 0
+    carry = b''
+    for partial_freq, partial_total, head, tail, no_whitespace in partials:
+        word_freq.update(partial_freq)
+        total_words += partial_total
+        carry += head
+        if not no_whitespace:
+            words = tokenizer(carry.decode('utf-8'))
+            word_freq.update(words)
+            total_words += len(words)
+            carry = tail
+    words = tokenizer(carry.decode('utf-8'))
+    word_freq.update(words)
+    total_words += len(words)
+    
+    return word_freq, total_words
+
+def word_count_compressed(file_path, workers=1, tokenizer=tokenize):
+    """
+    Compte les mots d'un fichier compressé sans le décompresser sur disque
+    
+    Avec workers > 1, les fichiers multi-flux sont décompressés en
+    parallèle ; si le fichier n'a qu'un flux (ou qu'une coupure tombe mal),
+    le comptage repasse en flux séquentiel.
+    
+    Args:
+        file_path: Chemin vers le fichier .gz, .bz2 ou .xz
+        workers: Nombre de processus
+        tokenizer: Découpage d'un bloc en mots (transmis aux processus fils)
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence}
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    ext = compression_format(file_path)
+    if not os.path.exists(file_path):
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    
+    start_time = time.time()
+    
+    if workers > 1:
+        result = _count_parallel(file_path, ext, workers, tokenizer)
+        if result is not None:
+            word_freq, total_words = result
+            return word_freq, total_words, time.time() - start_time
+        print("Fichier non découpable en flux indépendants : décompression séquentielle")
+    
+    word_freq, total_words, _ = count_stream(iter_decompressed_chunks(file_path), tokenizer)
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
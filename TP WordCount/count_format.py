@@ -0,0 +1,205 @@
+"""
+Format binaire fusionnable des tables de fréquences (.wcb)
+
+    magic b'WCB1' | varint nombre total de mots |
+    entrées (varint préfixe commun, varint longueur suffixe, suffixe, varint fréquence) |
+    varint 0, varint 0 (fin)
+
+Les clés sont les mots encodés en UTF-8, triés par octets (même ordre que
+les chaînes Python) : plusieurs fichiers se fusionnent donc en flux, par
+fusion k-voies, en O(taille totale) sans reconstruire de dictionnaire.
+
+Le lecteur accepte un préfixe commun avec la clé précédente, mais
+l'écriture le laisse à 0 : calculé en Python octet par octet, il coûtait
+plus cher que tout le reste de l'écriture.
+"""
+
+import os
+import heapq
+from operator import itemgetter
+from itertools import groupby
+
+MAGIC = b'WCB1'
+EXTENSION = '.wcb'
+_BUFFER_SIZE = 1024 * 1024
+_SMALL_VARINTS = [bytes((value,)) for value in range(0x80)]
+
+def _encode_varint(value):
+    if value < 0x80:
+        return _SMALL_VARINTS[value]
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+class _Reader:
+    """Lecture bufferisée des varints et octets d'un fichier .wcb"""
+    
+    def __init__(self, f):
+        self._f = f
+        self._buf = b''
+        self._pos = 0
+    
+    def _fill(self, n):
+        if len(self._buf) - self._pos < n:
+            self._buf = self._buf[self._pos:] + self._f.read(max(n, _BUFFER_SIZE))
+            self._pos = 0
+            if len(self._buf) < n:
+                raise ValueError("Fichier de comptes tronqué")
+    
+    def take(self, n):
+        self._fill(n)
+        data = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return data
+    
+    def varint(self):
+        result = 0
+        shift = 0
+        while True:
+            if self._pos >= len(self._buf):
+                self._fill(1)
+            byte = self._buf[self._pos]
+            self._pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+    
+    def entries(self):
+        """
+        Entrées jusqu'au marqueur de fin
+        
+        Les entrées dont les trois varints tiennent sur un octet (le cas
+        courant) sont décodées directement dans le tampon.
+        
+        Yields:
+            tuple: (longueur du préfixe commun, suffixe, fréquence)
+        """
+        while True:
+            buf = self._buf
+            pos = self._pos
+            if pos + 2 < len(buf) and buf[pos] < 0x80 and buf[pos + 1] < 0x80:
+                prefix_len = buf[pos]
+                end = pos + 2 + buf[pos + 1]
+                if end < len(buf) and buf[end] < 0x80 and end > pos + 2:
+                    self._pos = end + 1
+                    yield prefix_len, buf[pos + 2:end], buf[end]
+                    continue
+            prefix_len = self.varint()
+            suffix_len = self.varint()
+            if not prefix_len and not suffix_len:
+                return
+            suffix = self.take(suffix_len)
+            yield prefix_len, suffix, self.varint()
+
+def _open_reader(path):
+    f = open(path, 'rb')
+    reader = _Reader(f)
+    if reader.take(len(MAGIC)) != MAGIC:
+        f.close()
+        raise ValueError(f"{path} n'est pas un fichier de comptes {EXTENSION}")
+    return f, reader
+
+def read_total_words(path):
+    """Lit le nombre total de mots dans l'en-tête d'un fichier .wcb"""
+    f, reader = _open_reader(path)
+    with f:
+        return reader.varint()
+
+def iter_raw_counts(path):
+    """
+    Relit en flux un fichier .wcb
+    
+    Yields:
+        tuple: (mot encodé en UTF-8, fréquence) par ordre croissant
+    """
+    f, reader = _open_reader(path)
+    with f:
+        reader.varint()
+        key = b''
+        for prefix_len, suffix, freq in reader.entries():
+            key = key[:prefix_len] + suffix
+            yield key, freq
+
+def iter_count_file(path):
+    """
+    Relit en flux un fichier .wcb
+    
+    Yields:
+        tuple: (mot, fréquence) par ordre croissant de mot
+    """
+    for key, freq in iter_raw_counts(path):
+        yield key.decode('utf-8'), freq
+
+def write_raw_counts(path, items, total_words):
+    """
+    Écrit un fichier .wcb à partir de paires (mot UTF-8, fréquence) triées
+    
+    Returns:
+        int: Nombre de mots uniques écrits
+    """
+    unique_words = 0
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        out = bytearray(MAGIC)
+        out += _encode_varint(total_words)
+        for key, freq in items:
+            if len(key) < 0x80 and freq < 0x80:
+                out += bytes((0, len(key)))
+                out += key
+                out += _SMALL_VARINTS[freq]
+            else:
+                out += b'\x00'
+                out += _encode_varint(len(key))
+                out += key
+                out += _encode_varint(freq)
+            unique_words += 1
+            if len(out) >= _BUFFER_SIZE:
+                f.write(out)
+                out.clear()
+        out += b'\x00\x00'
+        f.write(out)
+    os.replace(tmp_path, path)
+    return unique_words
+
+def sorted_raw_counts(word_freq):
+    """
+    Paires (mot UTF-8, fréquence) d'une table, par ordre croissant
+    
+    Seule la liste des mots est triée ; les paires sont produites en flux.
+    Un CompactCounter fournit son propre export trié, sans décoder les clés.
+    """
+    if hasattr(word_freq, 'sorted_raw_items'):
+        return word_freq.sorted_raw_items()
+    return ((word.encode('utf-8'), word_freq[word]) for word in sorted(word_freq))
+
+def write_count_file(path, word_freq, total_words):
+    """Écrit une table de fréquences complète au format .wcb"""
+    return write_raw_counts(path, sorted_raw_counts(word_freq), total_words)
+
+def merge_raw_counts(iterables):
+    """
+    Fusionne des flux triés de (clé, fréquence) en sommant les clés égales
+    
+    Yields:
+        tuple: (clé, fréquence) par ordre croissant de clé
+    """
+    merged = heapq.merge(*iterables, key=itemgetter(0))
+    for key, group in groupby(merged, key=itemgetter(0)):
+        yield key, sum(freq for _, freq in group)
+
+def merge_count_files(output_path, input_paths):
+    """
+    Fusionne N fichiers .wcb en un seul, en flux
+    
+    Returns:
+        int: Nombre total de mots
+        int: Nombre de mots uniques
+    """
+    total_words = sum(read_total_words(path) for path in input_paths)
+    unique_words = write_raw_counts(
+        output_path, merge_raw_counts([iter_raw_counts(path) for path in input_paths]), total_words)
+    return total_words, unique_words
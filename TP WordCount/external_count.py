@@ -0,0 +1,103 @@
+"""
+Comptage hors mémoire (external aggregation)
+
+Le dictionnaire en mémoire est plafonné à max_keys mots : quand il est
+plein, il est trié et déversé dans un fichier temporaire (run). Les runs
+sont ensuite fusionnés par heapq.merge (fusion k-voies) en un fichier de
+comptes trié au format .wcb (voir count_format), qui se relit en flux sans
+être chargé en mémoire.
+"""
+
+import os
+import time
+import tempfile
+from collections import Counter
+
+from WordCount import iter_word_blocks
+from compressed_input import iter_input_chunks
+from ngram_count import iter_ngram_blocks
+from count_format import (EXTENSION, iter_raw_counts, merge_raw_counts,
+                          write_raw_counts, write_count_file)
+
+MAX_KEYS = 1_000_000
+# Nombre maximal de runs ouverts simultanément lors d'une passe de fusion
+MERGE_FAN_IN = 64
+
+def _new_run_path(tmp_dir):
+    fd, path = tempfile.mkstemp(prefix='wordcount_run_', suffix=EXTENSION, dir=tmp_dir)
+    os.close(fd)
+    return path
+
+def _spill(word_freq, tmp_dir):
+    """Trie le dictionnaire en mémoire et le déverse dans un nouveau run"""
+    path = _new_run_path(tmp_dir)
+    write_count_file(path, word_freq, sum(word_freq.values()))
+    return path
+
+def _merge_runs(runs, output_path, total_words, tmp_dir):
+    """Fusionne les runs par passes de MERGE_FAN_IN fichiers au plus"""
+    while len(runs) > MERGE_FAN_IN:
+        batch, runs = runs[:MERGE_FAN_IN], runs[MERGE_FAN_IN:]
+        path = _new_run_path(tmp_dir)
+        write_raw_counts(path, merge_raw_counts([iter_raw_counts(run) for run in batch]), 0)
+        for run in batch:
+            os.remove(run)
+        runs.append(path)
+    
+    unique_words = write_raw_counts(
+        output_path, merge_raw_counts([iter_raw_counts(run) for run in runs]), total_words)
+    for run in runs:
+        os.remove(run)
+    return unique_words
+
+def word_count_external(file_path, output_path, max_keys=MAX_KEYS, tmp_dir=None, ngram=1):
+    """
+    Compte les mots d'un fichier avec un dictionnaire en mémoire plafonné
+    
+    Args:
+        file_path: Chemin vers le fichier texte, ou '-' pour l'entrée standard
+        output_path: Fichier de comptes .wcb trié à produire
+        max_keys: Nombre maximal de mots distincts gardés en mémoire
+            (vérifié après chaque bloc de READ_HINT octets)
+        tmp_dir: Dossier des runs temporaires (défaut: dossier de output_path)
+        ngram: Compte les n-grammes de ngram mots consécutifs (voir ngram_count)
+    
+    Returns:
+        int: Nombre total de mots
+        int: Nombre de mots uniques
+        float: Temps d'exécution en secondes
+    """
+    if tmp_dir is None:
+        tmp_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(tmp_dir, exist_ok=True)
+    
+    word_freq = Counter()
+    total_words = 0
+    runs = []
+    
+    start_time = time.time()
+    
+    try:
+        for words in iter_ngram_blocks(iter_word_blocks(iter_input_chunks(file_path)), ngram):
+            word_freq.update(words)
+            total_words += len(words)
+            if len(word_freq) >= max_keys:
+                runs.append(_spill(word_freq, tmp_dir))
+                word_freq.clear()
+    
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        for run in runs:
+            os.remove(run)
+        return 0, 0, 0
+    
+    if word_freq or not runs:
+        runs.append(_spill(word_freq, tmp_dir))
+        word_freq.clear()
+    
+    unique_words = _merge_runs(runs, output_path, total_words, tmp_dir)
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return total_words, unique_words, execution_time
@@ -1,33 +1,158 @@
 import os
 import random
 import string
+import shutil
 import argparse
 import time
 
-def generate_text_file(size_mb, output_path, vocab_size=5000):
+PUNCTUATION = [',', '.', ';', '!', '?']
+PUNCTUATION_RATE = 0.1
+BATCH_WORDS = 1_000_000
+
+def build_vocabulary(vocab_size, seed=None):
+    """Crée un vocabulaire de mots aléatoires (reproductible avec seed)"""
+    rng = random.Random(seed)
+    vocabulary = []
+    for _ in range(vocab_size):
+        word_length = rng.randint(2, 10)
+        word = ''.join(rng.choices(string.ascii_lowercase, k=word_length))
+        vocabulary.append(word)
+    return vocabulary
+
+def build_token_table(vocabulary):
+    """
+    Précalcule toutes les formes écrites d'un mot
+    
+    Le jeton d'indice mot * 12 + ponctuation * 2 + saut_de_ligne vaut
+    mot + ponctuation éventuelle + ' ' + '\n' éventuel, en octets.
+    
+    Returns:
+        list: Jetons en octets
+    """
+    suffixes = [b' '] + [p.encode('ascii') + b' ' for p in PUNCTUATION]
+    return [word.encode('utf-8') + suffix + newline
+            for word in vocabulary
+            for suffix in suffixes
+            for newline in (b'', b'\n')]
+
+def zipf_cdf(vocab_size):
+    """Fonction de répartition de la loi de Zipf (exposant 1.07) sur les rangs"""
+    import numpy as np
+    ranks = np.arange(1, vocab_size + 1, dtype=np.float64)
+    cdf = np.cumsum(1.0 / ranks ** 1.07)
+    cdf /= cdf[-1]
+    return cdf
+
+def write_tokens(f, chars_needed, vocabulary, rng, progress=None):
+    """
+    Écrit des mots tirés selon la loi de Zipf jusqu'à chars_needed octets
+    
+    Les mots sont tirés par lots de BATCH_WORDS avec NumPy (fonction de
+    répartition précalculée) puis assemblés en un bloc d'octets écrit
+    d'un coup.
+    
+    Args:
+        f: Fichier ouvert en écriture binaire
+        chars_needed: Nombre d'octets à écrire
+        vocabulary: Liste des mots
+        rng: Générateur numpy.random.Generator
+        progress: Fonction appelée avec le nombre d'octets écrits après chaque lot
+    
+    Returns:
+        int: Nombre de mots écrits
+    """
+    import numpy as np
+    
+    vocab_size = len(vocabulary)
+    cdf = zipf_cdf(vocab_size)
+    token_table = build_token_table(vocabulary)
+    token_lengths = np.array([len(token) for token in token_table], dtype=np.int64)
+    
+    words_written = 0
+    bytes_written = 0
+    
+    while bytes_written < chars_needed:
+        n = BATCH_WORDS
+        word_ids = np.searchsorted(cdf, rng.random(n), side='right')
+        np.minimum(word_ids, vocab_size - 1, out=word_ids)
+        
+        punctuation = rng.integers(1, len(PUNCTUATION) + 1, n)
+        punctuation[rng.random(n) >= PUNCTUATION_RATE] = 0
+        
+        # Saut de ligne après le mot n° k si k est multiple d'un entier tiré dans [10, 15]
+        word_numbers = np.arange(words_written + 1, words_written + n + 1)
+        newlines = word_numbers % rng.integers(10, 16, n) == 0
+        
+        codes = word_ids * 12 + punctuation * 2 + newlines
+        
+        # Le dernier mot écrit est celui qui fait dépasser la taille cible
+        ends = np.cumsum(token_lengths[codes])
+        if ends[-1] >= chars_needed - bytes_written:
+            n = int(np.searchsorted(ends, chars_needed - bytes_written, side='left')) + 1
+            codes = codes[:n]
+        
+        f.write(b''.join(map(token_table.__getitem__, codes.tolist())))
+        words_written += n
+        bytes_written += int(ends[n - 1])
+        
+        if progress:
+            progress(bytes_written)
+    
+    return words_written
+
+def _generate_shard(task):
+    """Génère un fragment du corpus (exécuté dans un processus fils)"""
+    import numpy as np
+    shard_path, chars_needed, vocabulary, seed_sequence = task
+    with open(shard_path, 'wb') as f:
+        return write_tokens(f, chars_needed, vocabulary, np.random.default_rng(seed_sequence))
+
+def shard_dir_for(output_path):
+    """Dossier des fragments associé à un fichier de sortie (corpus_1GB.txt -> corpus_1GB_shards)"""
+    return os.path.splitext(output_path)[0] + "_shards"
+
+def _print_progress(mb_written, size_mb, start_time):
+    percent = (mb_written / size_mb) * 100
+    elapsed = time.time() - start_time
+    
+    if elapsed > 0:
+        speed = mb_written / elapsed
+        eta = (size_mb - mb_written) / speed if speed > 0 else 0
+        
+        if size_mb >= 1024:
+            gb_written = mb_written / 1024
+            total_gb = size_mb / 1024
+            print(f"Progression: {gb_written:.2f} GB / {total_gb:.1f} GB ({percent:.1f}%) - "
+                  f"Vitesse: {speed:.1f} MB/s - ETA: {eta/60:.1f} min", end='\r')
+        else:
+            print(f"Progression: {mb_written:.1f} MB / {size_mb} MB ({percent:.1f}%) - "
+                  f"Vitesse: {speed:.1f} MB/s - ETA: {eta:.0f}s", end='\r')
+
+def generate_text_file(size_mb, output_path, vocab_size=5000, seed=None, workers=1, keep_shards=False):
     """
     Génère un fichier texte de taille spécifiée
     
+    Avec workers > 1, le corpus est produit en workers fragments
+    indépendants dans un pool de processus, chacun avec sa propre graine
+    dérivée de seed, puis concaténés (ou laissés dans un dossier de
+    fragments si keep_shards).
+    
     Args:
         size_mb: Taille du fichier en Mo
         output_path: Chemin de sortie
         vocab_size: Taille du vocabulaire (mots uniques)
+        seed: Graine aléatoire (génération reproductible)
+        workers: Nombre de processus générateurs
+        keep_shards: Garde les fragments dans shard_dir_for(output_path)
     """
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+    
     if size_mb >= 1024:  
         vocab_size = min(50000, 5000 * (size_mb // 1024 + 1))
     
     print(f"Création du vocabulaire de {vocab_size} mots...")
-    vocabulary = []
-    for _ in range(vocab_size):
-        word_length = random.randint(2, 10)
-        word = ''.join(random.choices(string.ascii_lowercase, k=word_length))
-        vocabulary.append(word)
-    
-    print("Calcul de la distribution des mots...")
-    ranks = range(1, vocab_size + 1)
-    zipf_weights = [1.0 / (r ** 1.07) for r in ranks]
-    total_weight = sum(zipf_weights)
-    normalized_weights = [w / total_weight for w in zipf_weights]
+    vocabulary = build_vocabulary(vocab_size, seed)
     
     avg_word_length = 5
     chars_needed = int(size_mb * 1024 * 1024)
@@ -44,54 +169,55 @@ def generate_text_file(size_mb, output_path, vocab_size=5000):
     print(f"Vocabulaire: {vocab_size} mots uniques")
     print(f"Nombre de mots estimé: {words_needed:,}")
     
-    words_written = 0
     start_time = time.time()
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        buffer = []
-        buffer_size = 0
+    if workers <= 1:
+        rng = np.random.default_rng(seed)
+        with open(output_path, 'wb') as f:
+            words_written = write_tokens(
+                f, chars_needed, vocabulary, rng,
+                lambda n: _print_progress(n / (1024 * 1024), size_mb, start_time))
+        output_files = [output_path]
+    else:
+        print(f"Génération parallèle: {workers} fragments")
+        shard_dir = shard_dir_for(output_path)
+        os.makedirs(shard_dir, exist_ok=True)
         
-        while f.tell() < chars_needed:
-            word = random.choices(vocabulary, weights=normalized_weights)[0]
-            
-            if random.random() < 0.1:
-                punctuation = random.choice([',', '.', ';', '!', '?'])
-                f.write(word + punctuation + ' ')
-            else:
-                f.write(word + ' ')
-            
-            words_written += 1
-            
-            if words_written % random.randint(10, 15) == 0:
-                f.write('\n')
-            
-            if words_written % 50000 == 0:
-                mb_written = f.tell() / (1024 * 1024)
-                percent = (mb_written / size_mb) * 100
-                elapsed = time.time() - start_time
-                
-                if elapsed > 0:
-                    speed = mb_written / elapsed
-                    eta = (size_mb - mb_written) / speed if speed > 0 else 0
-                    
-                    if size_mb >= 1024:
-                        gb_written = mb_written / 1024
-                        total_gb = size_mb / 1024
-                        print(f"Progression: {gb_written:.2f} GB / {total_gb:.1f} GB ({percent:.1f}%) - "
-                              f"Vitesse: {speed:.1f} MB/s - ETA: {eta/60:.1f} min", end='\r')
-                    else:
-                        print(f"Progression: {mb_written:.1f} MB / {size_mb} MB ({percent:.1f}%) - "
-                              f"Vitesse: {speed:.1f} MB/s - ETA: {eta:.0f}s", end='\r')
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        shard_sizes = [chars_needed // workers + (i < chars_needed % workers) for i in range(workers)]
+        tasks = [(os.path.join(shard_dir, f"part-{i:05d}.txt"), shard_sizes[i], vocabulary, seeds[i])
+                 for i in range(workers)]
+        
+        words_written = 0
+        bytes_done = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for task, shard_words in zip(tasks, executor.map(_generate_shard, tasks)):
+                words_written += shard_words
+                bytes_done += task[1]
+                _print_progress(bytes_done / (1024 * 1024), size_mb, start_time)
+        
+        output_files = [task[0] for task in tasks]
+        if not keep_shards:
+            with open(output_path, 'wb') as out:
+                for shard_path in output_files:
+                    with open(shard_path, 'rb') as shard:
+                        shutil.copyfileobj(shard, out, 16 * 1024 * 1024)
+                    os.remove(shard_path)
+            os.rmdir(shard_dir)
+            output_files = [output_path]
     
     end_time = time.time()
     total_time = end_time - start_time
     
-    actual_size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    actual_size_mb = sum(os.path.getsize(path) for path in output_files) / (1024 * 1024)
     
     print(f"\n{'='*50}")
     print("FICHIER GÉNÉRÉ AVEC SUCCÈS")
     print('='*50)
-    print(f"Chemin: {output_path}")
+    if len(output_files) > 1:
+        print(f"Chemin: {os.path.dirname(output_files[0])} ({len(output_files)} fragments)")
+    else:
+        print(f"Chemin: {output_path}")
     
     if size_mb >= 1024:
         actual_size_gb = actual_size_mb / 1024
@@ -137,7 +263,7 @@ def parse_size_input(size_str):
         except ValueError:
             raise ValueError(f"Taille invalide: {size_str}. Utilisez 'MB' ou 'GB' (ex: 1GB, 500MB)")
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Générateur de fichiers texte pour benchmarks WordCount",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -160,6 +286,12 @@ Exemples:
   
   # Générer avec nom personnalisé
   python gen_corpus.py --size 1GB --name mon_fichier
+  
+  # Générer un fichier reproductible
+  python gen_corpus.py --size 100 --seed 42
+  
+  # Générer 10GB sur 8 processus, fragments gardés dans data/corpus_10GB_shards/
+  python gen_corpus.py --size 10GB --workers 8 --shards
         """
     )
     
@@ -174,8 +306,14 @@ Exemples:
                        help='Dossier de sortie (défaut: data)')
     parser.add_argument('--name', type=str,
                        help='Nom personnalisé du fichier (sans extension)')
+    parser.add_argument('--seed', type=int,
+                       help='Graine aléatoire pour une génération reproductible')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Nombre de processus générant des fragments en parallèle (défaut: 1)')
+    parser.add_argument('--shards', action='store_true',
+                       help='Garde les fragments dans un dossier <nom>_shards au lieu de les concaténer')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print("Générateur de corpus pour le benchmark WordCount")
     print("=" * 50)
@@ -210,7 +348,8 @@ Exemples:
                     print("Annulation.")
                     return
             
-            generate_text_file(size_mb, output_path)
+            generate_text_file(size_mb, output_path, seed=args.seed,
+                               workers=args.workers, keep_shards=args.shards)
             
         except ValueError as e:
             print(f"Erreur: {e}")
@@ -232,7 +371,8 @@ Exemples:
                     print("-" * 30)
                     continue
             
-            generate_text_file(size, output_path)
+            generate_text_file(size, output_path, seed=args.seed,
+                               workers=args.workers, keep_shards=args.shards)
             print("-" * 30)
     
     print("\n✅ Génération terminée!")
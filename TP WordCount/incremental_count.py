@@ -0,0 +1,143 @@
+"""
+Comptage incrémental des fichiers journaux en ajout seul
+
+L'état (dernier octet traité + comptes cumulés) est conservé entre deux
+exécutions : seule la fin ajoutée depuis est relue. La dernière ligne
+incomplète est laissée pour l'exécution suivante ; une troncature ou une
+rotation du fichier (autre inode, début du fichier différent) relance le
+comptage depuis le début.
+"""
+
+import os
+import time
+import marshal
+import hashlib
+from collections import Counter
+
+from WordCount import READ_HINT, iter_word_blocks
+
+DEFAULT_STATE_DIR = os.path.join("results", "state")
+# Nombre d'octets du début du fichier servant à reconnaître une rotation
+HEAD_BYTES = 4096
+_STATE_VERSION = 1
+
+def default_state_path(file_path, state_dir=DEFAULT_STATE_DIR):
+    """Fichier d'état associé à un fichier journal"""
+    digest = hashlib.blake2b(os.path.abspath(file_path).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(state_dir, f"{os.path.basename(file_path)}-{digest}.state")
+
+def load_state(state_path):
+    """Relit un état sauvegardé (None s'il est absent ou illisible)"""
+    try:
+        with open(state_path, 'rb') as f:
+            state = marshal.load(f)
+    except (FileNotFoundError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != _STATE_VERSION:
+        return None
+    return state
+
+def save_state(state_path, state):
+    """Écrit l'état de manière atomique (fichier temporaire puis os.replace)"""
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        marshal.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+def _head_hash(f, length):
+    f.seek(0)
+    return hashlib.blake2b(f.read(min(length, HEAD_BYTES)), digest_size=16).hexdigest()
+
+def _last_line_end(f, start, size):
+    """Position juste après le dernier saut de ligne de [start, size), ou start"""
+    pos = size
+    while pos > start:
+        block_start = max(start, pos - 64 * 1024)
+        f.seek(block_start)
+        index = f.read(pos - block_start).rfind(b'\n')
+        if index >= 0:
+            return block_start + index + 1
+        pos = block_start
+    return start
+
+def _read_range(f, start, end):
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(READ_HINT, remaining))
+        if not block:
+            break
+        remaining -= len(block)
+        yield block
+
+def word_count_incremental(file_path, state_path=None):
+    """
+    Compte les mots ajoutés à un fichier depuis la dernière exécution
+    
+    Args:
+        file_path: Chemin vers le fichier journal
+        state_path: Fichier d'état (défaut: default_state_path(file_path))
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence} cumulé
+        int: Nombre total de mots cumulé
+        float: Temps d'exécution en secondes
+    """
+    state_path = state_path or default_state_path(file_path)
+    
+    start_time = time.time()
+    
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    
+    with f:
+        stat = os.fstat(f.fileno())
+        state = load_state(state_path)
+        
+        if state is None:
+            reason = "premier comptage"
+        elif (state['device'], state['inode']) != (stat.st_dev, stat.st_ino):
+            reason = "rotation détectée (nouveau fichier)"
+        elif stat.st_size < state['offset']:
+            reason = "troncature détectée"
+        elif _head_hash(f, state['offset']) != state['head_hash']:
+            reason = "contenu réécrit depuis le dernier comptage"
+        else:
+            reason = None
+        
+        if reason:
+            print(f"Comptage complet: {reason}")
+            offset = 0
+            word_freq = Counter()
+            total_words = 0
+        else:
+            offset = state['offset']
+            word_freq = Counter(state['word_freq'])
+            total_words = state['total_words']
+        
+        end = _last_line_end(f, offset, stat.st_size)
+        for words in iter_word_blocks(_read_range(f, offset, end)):
+            word_freq.update(words)
+            total_words += len(words)
+        
+        print(f"Octets comptés: {end - offset:,} (position {end:,} / {stat.st_size:,})")
+        
+        save_state(state_path, {
+            'version': _STATE_VERSION,
+            'path': os.path.abspath(file_path),
+            'device': stat.st_dev,
+            'inode': stat.st_ino,
+            'offset': end,
+            'head_hash': _head_hash(f, end),
+            'total_words': total_words,
+            'word_freq': dict(word_freq),
+        })
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
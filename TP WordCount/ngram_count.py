@@ -0,0 +1,170 @@
+"""
+Comptage des n-grammes (bigrammes, trigrammes...)
+
+Un n-gramme est rangé sous une seule chaîne, ses mots séparés par une
+espace (un mot nettoyé ne contient jamais de blanc, la clé est donc sans
+ambiguïté) : pas de tuple de str par occurrence, et les clés passent telles
+quelles par le top-K, le format .wcb et le cache. La fenêtre glissante
+enjambe les fins de ligne et de bloc ; en parallèle, les n-grammes à cheval
+sur deux plages sont recomptés à partir des n - 1 premiers et derniers mots
+de chaque plage. Les moteurs en flux (approximatif, hors mémoire, compact)
+comptent les n-grammes produits par iter_ngram_blocks.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+from WordCount import CHUNK_SIZE, READ_HINT, tokenize, read_chunks, iter_word_blocks, _chunk_offsets
+
+def ngrams(words, n):
+    """
+    n-grammes successifs d'une liste de mots
+    
+    Returns:
+        iterator: Clés 'mot1 mot2 ...' (les mots eux-mêmes si n == 1)
+    """
+    if n == 1:
+        return iter(words)
+    return map(' '.join, zip(*(words[i:] for i in range(n))))
+
+def iter_ngram_blocks(word_blocks, n):
+    """
+    Transforme une suite de listes de mots en listes de n-grammes
+    
+    Les n - 1 derniers mots d'un bloc sont gardés pour former les
+    n-grammes qui commencent dans ce bloc et finissent dans le suivant.
+    
+    Yields:
+        list: n-grammes d'un bloc (les listes de mots telles quelles si n == 1)
+    """
+    if n == 1:
+        yield from word_blocks
+        return
+    window = []
+    
+    for words in word_blocks:
+        if not words:
+            continue
+        sequence = window + words if window else words
+        yield list(ngrams(sequence, n))
+        window = sequence[max(0, len(sequence) - n + 1):]
+
+def count_ngram_blocks(word_blocks, n):
+    """
+    Compte les n-grammes d'une suite de listes de mots
+    
+    Returns:
+        Counter: Dictionnaire {n-gramme: fréquence}
+        int: Nombre total de n-grammes
+    """
+    ngram_freq = Counter()
+    total = 0
+    
+    for block in iter_ngram_blocks(word_blocks, n):
+        ngram_freq.update(block)
+        total += len(block)
+    
+    return ngram_freq, total
+
+def word_count_ngram(file_path, n):
+    """
+    Compte les n-grammes d'un fichier en flux (fichier, entrée standard ou
+    fichier compressé)
+    
+    Args:
+        file_path: Chemin vers le fichier texte, ou '-' pour l'entrée standard
+        n: Taille des n-grammes
+    
+    Returns:
+        dict: Dictionnaire {n-gramme: fréquence}
+        int: Nombre total de n-grammes
+        float: Temps d'exécution en secondes
+    """
+    from compressed_input import compression_format, iter_decompressed_chunks
+    
+    start_time = time.time()
+    
+    if file_path == '-':
+        ngram_freq, total = count_ngram_blocks(iter_word_blocks(read_chunks(sys.stdin.buffer)), n)
+    elif not os.path.exists(file_path):
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    elif compression_format(file_path):
+        ngram_freq, total = count_ngram_blocks(iter_word_blocks(iter_decompressed_chunks(file_path)), n)
+    else:
+        with open(file_path, 'rb') as f:
+            ngram_freq, total = count_ngram_blocks(iter_word_blocks(read_chunks(f, READ_HINT)), n)
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return ngram_freq, total, execution_time
+
+def _count_ngram_chunk(task):
+    """
+    Compte les n-grammes internes à une plage d'octets (processus fils)
+    
+    Returns:
+        tuple: (comptes, total, n - 1 premiers mots, n - 1 derniers mots)
+    """
+    file_path, start, end, n = task
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        words = tokenize(f.read(end - start).decode('utf-8'))
+    
+    edge = n - 1
+    return (Counter(ngrams(words, n)), max(0, len(words) - edge),
+            words[:edge], words[max(0, len(words) - edge):] if edge else [])
+
+def word_count_ngram_parallel(file_path, n, workers=None):
+    """
+    Compte les n-grammes d'un fichier en parallèle
+    
+    Même découpage que word_count_parallel ; le résultat est identique à
+    celui de word_count_ngram.
+    
+    Args:
+        file_path: Chemin vers le fichier texte
+        n: Taille des n-grammes
+        workers: Nombre de processus (défaut: nombre de cœurs)
+    
+    Returns:
+        dict: Dictionnaire {n-gramme: fréquence}
+        int: Nombre total de n-grammes
+        float: Temps d'exécution en secondes
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    start_time = time.time()
+    
+    try:
+        size = os.path.getsize(file_path)
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    
+    n_chunks = max(workers, -(-size // CHUNK_SIZE))
+    tasks = [(file_path, start, end, n) for start, end in _chunk_offsets(file_path, n_chunks)]
+    
+    ngram_freq = Counter()
+    total = 0
+    window = []
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial_freq, partial_total, head, tail in executor.map(_count_ngram_chunk, tasks):
+            ngram_freq.update(partial_freq)
+            total += partial_total
+            # window et head ont chacun moins de n mots : tout n-gramme de
+            # leur concaténation est à cheval sur la frontière
+            sequence = window + head
+            ngram_freq.update(ngrams(sequence, n))
+            total += max(0, len(sequence) - n + 1)
+            window = tail if len(head) == n - 1 else sequence[max(0, len(sequence) - n + 1):]
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return ngram_freq, total, execution_time
@@ -0,0 +1,76 @@
+"""
+Normalisation Unicode facultative des mots : NFKC, casefold et mots vides
+
+Avec la tokenisation par défaut, « é » composé (NFC) et décomposé (NFD),
+« ﬁ » et « fi » ou « Straße » et « STRASSE » donnent des mots différents.
+Normalizer remplace tokenize par NFKC + casefold, appliqués à un bloc
+entier : un bloc pur ASCII (le cas courant) n'est pas normalisé du tout,
+et dans les autres seules les lignes non ASCII et non déjà en NFKC passent
+par unicodedata.normalize.
+"""
+
+import unicodedata
+
+from WordCount import _PUNCTUATION
+
+# Liste courte de mots vides du français (--stopwords fr)
+FRENCH_STOPWORDS = (
+    "a au aux avec ce ces c cette d dans de des du elle en et eux il ils je j la le les leur "
+    "leurs l lui ma mais me m même mes moi mon ne n nos notre nous on ou où par pas pour qu "
+    "que qui s sa se ses son sur ta te tes toi ton tu un une vos votre vous y est sont été "
+    "être avoir ont"
+).split()
+BUILTIN_STOPWORDS = {"fr": FRENCH_STOPWORDS}
+
+def _normalize_lines(text):
+    """NFKC ligne par ligne, en sautant les lignes ASCII ou déjà normalisées"""
+    return ''.join(
+        line if line.isascii() or unicodedata.is_normalized('NFKC', line)
+        else unicodedata.normalize('NFKC', line)
+        for line in text.splitlines(keepends=True)
+    )
+
+def load_stopwords(spec):
+    """
+    Charge une liste de mots vides
+    
+    Args:
+        spec: Nom d'une liste intégrée ('fr') ou fichier texte (mots séparés par des blancs)
+    
+    Returns:
+        list: Mots vides, non normalisés
+    """
+    if spec in BUILTIN_STOPWORDS:
+        return list(BUILTIN_STOPWORDS[spec])
+    with open(spec, 'r', encoding='utf-8') as f:
+        return f.read().split()
+
+class Normalizer:
+    """
+    Tokeniseur normalisant, utilisable à la place de tokenize
+    
+    Les mots vides passent par la même normalisation que le texte. Les
+    instances se transmettent aux processus fils du moteur parallèle.
+    
+    Args:
+        stopwords: Mots à écarter du comptage
+    """
+    
+    def __init__(self, stopwords=()):
+        self.stopwords = frozenset(word for stopword in stopwords for word in self._tokenize(stopword))
+    
+    @staticmethod
+    def _tokenize(text):
+        if text.isascii():
+            # NFKC ne change rien à l'ASCII et casefold y équivaut à lower
+            text = text.lower()
+        else:
+            text = _normalize_lines(text).casefold()
+        return _PUNCTUATION.sub('', text).split()
+    
+    def __call__(self, text):
+        words = self._tokenize(text)
+        if self.stopwords:
+            stopwords = self.stopwords
+            words = [word for word in words if word not in stopwords]
+        return words
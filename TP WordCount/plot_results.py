@@ -1,11 +1,18 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+"""
+Graphiques des résultats de benchmark
+
+pandas, matplotlib et numpy ne sont importés que par les fonctions de
+tracé : importer ce module (ou lancer cli.py) reste léger.
+"""
+
 import os
 import sys
+import argparse
 
 def load_results(csv_file="results/benchmark_results.csv"):
     """Charge les résultats depuis le CSV"""
+    import pandas as pd
+    
     if not os.path.exists(csv_file):
         print(f"Erreur: Fichier {csv_file} non trouvé")
         print("Exécute d'abord: python run_bench.py")
@@ -13,20 +20,36 @@ def load_results(csv_file="results/benchmark_results.csv"):
     
     return pd.read_csv(csv_file)
 
+def select_warm_runs(df):
+    """Garde les mesures à cache chaud, avec une colonne moteur (anciens CSV: séquentiel)"""
+    if 'moteur' not in df.columns:
+        df = df.assign(moteur='sequentiel')
+    if 'cache' in df.columns:
+        df = df[df['cache'] == 'chaud']
+    return df.sort_values('taille_mb')
+
 def plot_execution_time_only(df):
-    """Trace uniquement le temps d'exécution en fonction de la taille"""
-    plt.figure(figsize=(10, 6))
+    """Trace le temps d'exécution de chaque moteur en fonction de la taille"""
+    import matplotlib.pyplot as plt
+    
+    df = select_warm_runs(df)
     
-    plt.plot(df['taille_mb'], df['temps_moyen'], 'bo-', 
-             linewidth=2.5, markersize=10, markerfacecolor='white', 
-             markeredgewidth=2, markeredgecolor='blue',
-             label='Temps moyen d\'exécution')
+    plt.figure(figsize=(10, 6))
     
-    for i, row in df.iterrows():
-        plt.vlines(row['taille_mb'], row['temps_min'], row['temps_max'], 
-                  colors='red', alpha=0.5, linewidth=2, zorder=1)
-        plt.plot(row['taille_mb'], row['temps_min'], 'v', color='red', markersize=6, alpha=0.7, zorder=2)
-        plt.plot(row['taille_mb'], row['temps_max'], '^', color='red', markersize=6, alpha=0.7, zorder=2)
+    for engine, group in df.groupby('moteur', sort=False):
+        line, = plt.plot(group['taille_mb'], group['temps_moyen'], 'o-',
+                         linewidth=2.5, markersize=10, markerfacecolor='white',
+                         markeredgewidth=2, label=f'{engine}')
+        color = line.get_color()
+        
+        for i, row in group.iterrows():
+            plt.vlines(row['taille_mb'], row['temps_min'], row['temps_max'], 
+                      colors=color, alpha=0.5, linewidth=2, zorder=1)
+            plt.plot(row['taille_mb'], row['temps_min'], 'v', color=color, markersize=6, alpha=0.7, zorder=2)
+            plt.plot(row['taille_mb'], row['temps_max'], '^', color=color, markersize=6, alpha=0.7, zorder=2)
+            plt.text(row['taille_mb'], row['temps_moyen'] + 0.02 * max(df['temps_moyen']),
+                    f"{row['temps_moyen']:.2f}s", color=color,
+                    ha='center', va='bottom', fontsize=9, fontweight='bold')
     
     plt.title('Évolution du temps d\'exécution du Word Count\nen fonction de la taille du fichier', 
               fontsize=14, fontweight='bold', pad=20)
@@ -34,18 +57,13 @@ def plot_execution_time_only(df):
     plt.ylabel('Temps d\'exécution (secondes)', fontsize=12)
     plt.grid(True, alpha=0.3, linestyle='--')
     
-    for i, row in df.iterrows():
-        plt.text(row['taille_mb'], row['temps_moyen'] + 0.02 * max(df['temps_moyen']),
-                f"{row['temps_moyen']:.2f}s", 
-                ha='center', va='bottom', fontsize=10, fontweight='bold')
-    
-    plt.legend(loc='upper left', fontsize=11, framealpha=0.9)
+    plt.legend(title='Moteur (cache chaud)', loc='upper left', fontsize=11, framealpha=0.9)
     
     y_min = min(df['temps_min']) * 0.8
     y_max = max(df['temps_max']) * 1.1
     plt.ylim(y_min, y_max)
     
-    plt.xticks(df['taille_mb'])
+    plt.xticks(df['taille_mb'].unique())
     plt.tight_layout()
     
     os.makedirs('results', exist_ok=True)
@@ -57,14 +75,105 @@ def plot_execution_time_only(df):
     print("RÉSUMÉ DES TEMPS D'EXÉCUTION")
     print("="*70)
     for _, row in df.iterrows():
-        print(f"{row['fichier']} ({row['taille_mb']} MB):")
+        print(f"{row['fichier']} ({row['taille_mb']} MB) - {row['moteur']}:")
         print(f"  Temps moyen: {row['temps_moyen']:.3f} s")
         print(f"  Variation: {row['temps_min']:.3f} - {row['temps_max']:.3f} s")
         print(f"  Temps par MB: {row['temps_moyen']/row['taille_mb']:.4f} s/MB")
+        if 'debit_mo_s' in row:
+            print(f"  Débit: {row['debit_mo_s']:.1f} MB/s - {row['mots_par_s']:,.0f} mots/s")
         print()
 
-def main():
+def plot_memory_usage(df):
+    """Trace le pic mémoire et le ratio temps CPU / temps mur de chaque moteur"""
+    import matplotlib.pyplot as plt
+    
+    df = select_warm_runs(df)
+    
+    fig, (ax_mem, ax_cpu) = plt.subplots(1, 2, figsize=(14, 6))
+    
+    for engine, group in df.groupby('moteur', sort=False):
+        line, = ax_mem.plot(group['taille_mb'], group['rss_pic_mo'], 'o-',
+                            linewidth=2, markersize=8, label=f'{engine} (RSS)')
+        ax_mem.plot(group['taille_mb'], group['tracemalloc_pic_mo'], 's--',
+                    color=line.get_color(), linewidth=1.5, markersize=6, alpha=0.7,
+                    label=f'{engine} (tracemalloc)')
+        ax_cpu.plot(group['taille_mb'], group['ratio_cpu_mur'], 'o-',
+                    color=line.get_color(), linewidth=2, markersize=8, label=engine)
+    
+    ax_mem.set_title('Pic mémoire en fonction de la taille du fichier', fontsize=13, fontweight='bold')
+    ax_mem.set_xlabel('Taille du fichier (MB)', fontsize=12)
+    ax_mem.set_ylabel('Pic mémoire (Mo)', fontsize=12)
+    ax_mem.grid(True, alpha=0.3, linestyle='--')
+    ax_mem.legend(fontsize=9, framealpha=0.9)
+    
+    ax_cpu.axhline(1, color='gray', linestyle=':', linewidth=1)
+    ax_cpu.set_title('Temps CPU / temps mur (efficacité parallèle)', fontsize=13, fontweight='bold')
+    ax_cpu.set_xlabel('Taille du fichier (MB)', fontsize=12)
+    ax_cpu.set_ylabel('Temps CPU / temps mur', fontsize=12)
+    ax_cpu.grid(True, alpha=0.3, linestyle='--')
+    ax_cpu.legend(fontsize=10, framealpha=0.9)
+    
+    plt.tight_layout()
+    
+    os.makedirs('results', exist_ok=True)
+    plt.savefig('results/memory_usage_graph.png', dpi=300, bbox_inches='tight')
+    plt.savefig('results/memory_usage_graph.pdf', bbox_inches='tight')
+    plt.show()
+
+def plot_scaling(csv_file="results/scaling_results.csv"):
+    """Trace accélération, efficacité et débit en fonction du nombre de processus"""
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    
+    df = pd.read_csv(csv_file).sort_values('workers')
+    strong = df[df['type'] == 'fort']
+    weak = df[df['type'] == 'faible']
+    workers = np.sort(df['workers'].unique())
+    
+    fig, (ax_speedup, ax_eff, ax_rate) = plt.subplots(1, 3, figsize=(18, 6))
+    
+    ax_speedup.plot(workers, workers, ':', color='gray', linewidth=1.5, label='idéale')
+    for file_name, group in strong.groupby('fichier', sort=False):
+        line, = ax_speedup.plot(group['workers'], group['acceleration'], 'o-',
+                                linewidth=2, markersize=8, label=f'{file_name} ({group["taille_mb"].iloc[0]:g} MB)')
+        ax_eff.plot(group['workers'], group['efficacite'], 'o-', color=line.get_color(),
+                    linewidth=2, markersize=8, label=f'fort - {file_name}')
+        ax_rate.plot(group['workers'], group['debit_mo_s'], 'o-', color=line.get_color(),
+                     linewidth=2, markersize=8, label=file_name)
+    if not weak.empty:
+        ax_eff.plot(weak['workers'], weak['efficacite'], 's--', color='black',
+                    linewidth=2, markersize=7, label='faible (taille x processus)')
+        ax_rate.plot(weak['workers'], weak['debit_mo_s'], 's--', color='black',
+                     linewidth=2, markersize=7, label='faible')
+    
+    ax_speedup.set_title('Accélération T(1) / T(p) (taille fixe)', fontsize=13, fontweight='bold')
+    ax_speedup.set_ylabel('Accélération', fontsize=12)
+    ax_eff.axhline(1, color='gray', linestyle=':', linewidth=1)
+    ax_eff.set_title('Efficacité parallèle', fontsize=13, fontweight='bold')
+    ax_eff.set_ylabel('Efficacité', fontsize=12)
+    ax_eff.set_ylim(0, 1.1)
+    ax_rate.set_title('Débit', fontsize=13, fontweight='bold')
+    ax_rate.set_ylabel('Débit (MB/s)', fontsize=12)
+    for ax in (ax_speedup, ax_eff, ax_rate):
+        ax.set_xlabel('Nombre de processus', fontsize=12)
+        ax.set_xticks(workers)
+        ax.grid(True, alpha=0.3, linestyle='--')
+        ax.legend(fontsize=9, framealpha=0.9)
+    
+    plt.tight_layout()
+    
+    os.makedirs('results', exist_ok=True)
+    plt.savefig('results/speedup_efficiency_graph.png', dpi=300, bbox_inches='tight')
+    plt.savefig('results/speedup_efficiency_graph.pdf', bbox_inches='tight')
+    plt.show()
+
+def main(argv=None):
     """Fonction principale simplifiée"""
+    argparse.ArgumentParser(
+        description="Graphiques des benchmarks (results/benchmark_results.csv, results/scaling_results.csv)"
+    ).parse_args(argv)
+    
     print("GRAPHIQUE TEMPS D'EXÉCUTION vs TAILLE")
     print("=" * 50)
     
@@ -73,6 +182,14 @@ def main():
     plot_execution_time_only(df)
     
     print("Graphique sauvegardé dans 'results/execution_time_graph.png'")
+    
+    if 'rss_pic_mo' in df.columns:
+        plot_memory_usage(df)
+        print("Graphique sauvegardé dans 'results/memory_usage_graph.png'")
+    
+    if os.path.exists("results/scaling_results.csv"):
+        plot_scaling()
+        print("Graphique sauvegardé dans 'results/speedup_efficiency_graph.png'")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
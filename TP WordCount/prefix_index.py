@@ -0,0 +1,197 @@
+"""
+Index trié du vocabulaire : requêtes par préfixe, par intervalle et top-K
+
+Les mots sont rangés dans un tableau trié (ordre des chaînes Python, qui
+est aussi celui des clés UTF-8 du format .wcb) et interrogés par bisect ;
+un second tableau donne les positions des mots par fréquence décroissante.
+
+Sur disque, l'index tient dans deux fichiers voisins : la table .wcb
+(déjà triée) et un fichier .wcx contenant le classement par fréquence.
+Le rechargement ne retrie donc rien. WordCount.py ne les écrit qu'avec
+--index : l'index coûte deux tris complets du vocabulaire.
+
+    .wcx : magic b'WCX1' | nombre de mots (8 octets, petit-boutiste) |
+           boutisme des positions (b'l' ou b'b') | positions (uint32)
+"""
+
+import os
+import sys
+import heapq
+import bisect
+from array import array
+from collections import Counter
+
+from count_format import iter_count_file, write_raw_counts, sorted_raw_counts
+
+INDEX_MAGIC = b'WCX1'
+INDEX_EXTENSION = '.wcx'
+_BYTEORDER = sys.byteorder
+
+def index_path_for(counts_path):
+    """Fichier .wcx associé à une table .wcb"""
+    return os.path.splitext(counts_path)[0] + INDEX_EXTENSION
+
+def _prefix_end(prefix):
+    """Plus petite chaîne supérieure à toutes celles qui commencent par prefix"""
+    last = ord(prefix[-1])
+    if last == sys.maxunicode:
+        return None
+    return prefix[:-1] + chr(last + 1)
+
+def _rank_by_freq(counts):
+    """
+    Positions par fréquence décroissante (à égalité, ordre alphabétique)
+    
+    Tri par dénombrement : peu de fréquences distinctes, et seul le tableau
+    résultat (4 octets par mot) est alloué, sans liste de positions.
+    """
+    n_by_count = Counter(counts)
+    next_slot = {}
+    slot = 0
+    for count in sorted(n_by_count, reverse=True):
+        next_slot[count] = slot
+        slot += n_by_count[count]
+    by_freq = array('I', bytes(4 * len(counts)))
+    for position, count in enumerate(counts):
+        by_freq[next_slot[count]] = position
+        next_slot[count] += 1
+    return by_freq
+
+def _save_ranks(index_path, by_freq):
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(INDEX_MAGIC)
+        f.write(len(by_freq).to_bytes(8, 'little'))
+        f.write(_BYTEORDER[0].encode('ascii'))
+        by_freq.tofile(f)
+    os.replace(tmp_path, index_path)
+
+def save_index(counts_path, word_freq, total_words):
+    """
+    Écrit la table .wcb d'un dictionnaire {mot: fréquence} et son classement .wcx
+    
+    La table est écrite en flux ; seules les fréquences (8 octets par mot)
+    sont gardées pour calculer le classement.
+    """
+    counts = array('Q')
+    
+    def collect(items):
+        for key, freq in items:
+            counts.append(freq)
+            yield key, freq
+    
+    write_raw_counts(counts_path, collect(sorted_raw_counts(word_freq)), total_words)
+    _save_ranks(index_path_for(counts_path), _rank_by_freq(counts))
+
+class PrefixIndex:
+    """
+    Vocabulaire trié et classement par fréquence
+    
+    Args:
+        words: Mots triés
+        counts: Fréquences, dans l'ordre de words
+        by_freq: Positions des mots par fréquence décroissante (à égalité,
+            ordre alphabétique) ; calculé si absent
+    """
+    
+    def __init__(self, words, counts, by_freq=None):
+        self.words = words
+        self.counts = counts
+        self.by_freq = _rank_by_freq(counts) if by_freq is None else by_freq
+    
+    @classmethod
+    def from_counts(cls, word_freq):
+        """Construit l'index d'un dictionnaire {mot: fréquence}"""
+        words = sorted(word_freq)
+        return cls(words, array('Q', map(word_freq.__getitem__, words)))
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def get(self, word, default=0):
+        """Fréquence d'un mot (recherche dichotomique)"""
+        i = bisect.bisect_left(self.words, word)
+        if i < len(self.words) and self.words[i] == word:
+            return self.counts[i]
+        return default
+    
+    def prefix_span(self, prefix):
+        """Positions [début, fin) des mots commençant par prefix"""
+        if not prefix:
+            return 0, len(self.words)
+        start = bisect.bisect_left(self.words, prefix)
+        end_word = _prefix_end(prefix)
+        end = len(self.words) if end_word is None else bisect.bisect_left(self.words, end_word, start)
+        return start, end
+    
+    def _items(self, start, end, limit):
+        if limit is not None:
+            end = min(end, start + max(limit, 0))
+        return list(zip(self.words[start:end], self.counts[start:end]))
+    
+    def prefix(self, prefix, limit=None):
+        """Mots commençant par prefix et leur fréquence, par ordre alphabétique"""
+        return self._items(*self.prefix_span(prefix), limit)
+    
+    def range(self, low=None, high=None, limit=None):
+        """Mots w tels que low <= w < high (bornes facultatives), par ordre alphabétique"""
+        start = 0 if low is None else bisect.bisect_left(self.words, low)
+        end = len(self.words) if high is None else bisect.bisect_left(self.words, high, start)
+        return self._items(start, max(start, end), limit)
+    
+    def top(self, k, prefix=''):
+        """
+        Les k mots les plus fréquents parmi ceux qui commencent par prefix
+        
+        Sur un petit intervalle, sélection par tas sur ses seules fréquences ;
+        sur un grand, parcours du classement global jusqu'à k mots retenus
+        (environ k * V / intervalle positions lues).
+        """
+        start, end = self.prefix_span(prefix)
+        span = end - start
+        if k <= 0 or not span:
+            return []
+        if span * span <= k * len(self.words):
+            positions = heapq.nlargest(k, range(start, end), key=self.counts.__getitem__)
+        else:
+            positions = []
+            for position in self.by_freq:
+                if start <= position < end:
+                    positions.append(position)
+                    if len(positions) == k:
+                        break
+        return [(self.words[i], self.counts[i]) for i in positions]
+    
+    @classmethod
+    def load(cls, counts_path):
+        """
+        Recharge un index à partir d'une table .wcb et de son .wcx
+        
+        Sans .wcx valide (absent, ou plus ancien que la table), le
+        classement est recalculé.
+        """
+        words = []
+        counts = array('Q')
+        for word, freq in iter_count_file(counts_path):
+            words.append(word)
+            counts.append(freq)
+        return cls(words, counts, _load_ranks(counts_path, len(words)))
+
+def _load_ranks(counts_path, n_words):
+    index_path = index_path_for(counts_path)
+    try:
+        if os.path.getmtime(index_path) < os.path.getmtime(counts_path):
+            return None
+        with open(index_path, 'rb') as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                return None
+            if int.from_bytes(f.read(8), 'little') != n_words:
+                return None
+            byteorder = f.read(1)
+            by_freq = array('I')
+            by_freq.fromfile(f, n_words)
+    except (FileNotFoundError, EOFError):
+        return None
+    if byteorder != _BYTEORDER[0].encode('ascii'):
+        by_freq.byteswap()
+    return by_freq
@@ -0,0 +1,140 @@
+"""
+Instrumentation du comptage : temps par phase et progression
+
+Le comptage instrumenté reprend la boucle de word_count_sequential en
+mesurant séparément lecture, décodage, tokenisation et comptage (le top-K
+est mesuré par l'appelant). Comparer la lecture au reste indique si une
+exécution est limitée par les entrées/sorties ou par le CPU.
+"""
+
+import sys
+import time
+import codecs
+from collections import Counter
+from contextlib import contextmanager
+
+from WordCount import READ_HINT, tokenize
+
+PHASES = ('lecture', 'decodage', 'tokenisation', 'comptage', 'top_k')
+
+class PhaseTimer:
+    """
+    Cumule le temps passé dans chaque phase et affiche la progression
+    
+    Args:
+        progress_interval: Secondes entre deux lignes de progression (None: aucune)
+        total_bytes: Taille attendue, pour afficher un pourcentage
+        stream: Flux de sortie de la progression et du rapport
+    """
+    
+    def __init__(self, progress_interval=None, total_bytes=None, stream=sys.stderr):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.bytes_read = 0
+        self.tokens = 0
+        self.progress_interval = progress_interval
+        self.total_bytes = total_bytes
+        self.stream = stream
+        self._start = time.perf_counter()
+        self._last_progress = self._start
+    
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - start
+    
+    def advance(self, n_bytes, n_tokens):
+        """Comptabilise un bloc traité et affiche la progression si l'intervalle est écoulé"""
+        self.bytes_read += n_bytes
+        self.tokens += n_tokens
+        if self.progress_interval is None:
+            return
+        now = time.perf_counter()
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.print_progress(now - self._start)
+    
+    def print_progress(self, elapsed):
+        done = f"{self.bytes_read / (1024 * 1024):,.0f} Mo"
+        if self.total_bytes:
+            done += f" ({self.bytes_read / self.total_bytes:.0%})"
+        print(f"  {done} - {self.bytes_read / (1024 * 1024) / elapsed:,.1f} Mo/s - "
+              f"{self.tokens / elapsed:,.0f} mots/s", file=self.stream, flush=True)
+    
+    def bound(self):
+        """'E/S' si la lecture domine le traitement, sinon 'CPU'"""
+        processing = sum(t for name, t in self.times.items() if name != 'lecture')
+        return "E/S" if self.times['lecture'] > processing else "CPU"
+    
+    def as_dict(self):
+        """Temps par phase (temps_<phase>), total et limitation dominante"""
+        row = {f"temps_{name}": seconds for name, seconds in self.times.items()}
+        row["temps_phases"] = sum(self.times.values())
+        row["limite_par"] = self.bound()
+        return row
+    
+    def report(self):
+        """Affiche la répartition du temps par phase"""
+        total = sum(self.times.values()) or 1
+        print(f"\nRépartition par phase (limité par: {self.bound()}):", file=self.stream)
+        print("-" * 40, file=self.stream)
+        for name, seconds in self.times.items():
+            print(f"{name:14} : {seconds:8.4f}s {seconds / total:6.1%}", file=self.stream)
+
+def word_count_profiled(file_path, timer):
+    """
+    Compte les mots comme word_count_sequential, phase par phase
+    
+    Args:
+        file_path: Chemin vers le fichier texte
+        timer: PhaseTimer qui reçoit les mesures
+    
+    Returns:
+        dict: Dictionnaire {mot: fréquence}
+        int: Nombre total de mots
+        float: Temps d'exécution en secondes
+    """
+    word_freq = Counter()
+    total_words = 0
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = ''
+    
+    start_time = time.time()
+    
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        print(f"Erreur: Fichier {file_path} non trouvé")
+        return {}, 0, 0
+    
+    with f:
+        while True:
+            with timer.phase('lecture'):
+                chunk = f.read(READ_HINT)
+            final = not chunk
+            
+            with timer.phase('decodage'):
+                text = carry + decoder.decode(chunk, final=final)
+                if final or not text or text[-1].isspace():
+                    carry = ''
+                else:
+                    parts = text.rsplit(None, 1)
+                    text, carry = parts if len(parts) == 2 else ('', parts[0])
+            
+            with timer.phase('tokenisation'):
+                words = tokenize(text)
+            
+            with timer.phase('comptage'):
+                word_freq.update(words)
+            
+            total_words += len(words)
+            timer.advance(len(chunk), len(words))
+            if final:
+                break
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return word_freq, total_words, execution_time
@@ -0,0 +1,146 @@
+"""
+Cache persistant des résultats de comptage
+
+Un résultat complet (word_freq, total_words) est stocké au format binaire
+marshal sous une clé dérivée du chemin, de la taille et de la date de
+modification du fichier (plus, en option, une empreinte rapide de son
+contenu). La taille du cache est bornée : les entrées les moins récemment
+utilisées sont supprimées en premier.
+
+Une entrée commence par un court en-tête (total, nombre de mots uniques,
+TOP_CACHED mots les plus fréquents) : un affichage du top se relit sans
+charger la table complète.
+
+    longueur de l'en-tête (8 octets, petit-boutiste) | en-tête marshal | table marshal
+"""
+
+import os
+import time
+import marshal
+import hashlib
+
+from WordCount import top_words
+
+DEFAULT_CACHE_DIR = os.path.join("results", "cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Taille de chacun des trois échantillons (début, milieu, fin) de l'empreinte rapide
+SAMPLE_BYTES = 1024 * 1024
+# Taille du top gardé dans l'en-tête des entrées
+TOP_CACHED = 1000
+_FORMAT_VERSION = 2
+
+def fast_hash(file_path):
+    """
+    Empreinte rapide du contenu : BLAKE2 du début, du milieu et de la fin du fichier
+    
+    Détecte une réécriture qui conserverait taille et date de modification
+    sans relire tout le fichier.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.blake2b(str(size).encode('ascii'), digest_size=16)
+    with open(file_path, 'rb') as f:
+        for offset in sorted({0, max(0, size // 2 - SAMPLE_BYTES // 2), max(0, size - SAMPLE_BYTES)}):
+            f.seek(offset)
+            digest.update(f.read(SAMPLE_BYTES))
+    return digest.hexdigest()
+
+def cache_key(file_path, options=(), use_hash=False):
+    """
+    Calcule la clé de cache d'un fichier
+    
+    Args:
+        file_path: Chemin vers le fichier texte
+        options: Options de comptage influant sur le résultat
+        use_hash: Ajoute l'empreinte rapide du contenu à la clé
+    
+    Returns:
+        str: Clé hexadécimale
+    """
+    stat = os.stat(file_path)
+    parts = [_FORMAT_VERSION, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, tuple(options)]
+    if use_hash:
+        parts.append(fast_hash(file_path))
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+class ResultCache:
+    """Cache de résultats sur disque, borné à max_bytes octets (éviction LRU)"""
+    
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+    
+    def _read(self, key, full):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                header_len = int.from_bytes(f.read(8), 'little')
+                header = marshal.loads(f.read(header_len))
+                # marshal.loads sur un tampon : marshal.load lit le fichier par petits morceaux
+                word_freq = marshal.loads(f.read()) if full else None
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            return None
+        # La date d'accès sert à l'éviction LRU
+        os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        return header, word_freq
+    
+    def get(self, key):
+        """
+        Relit un résultat complet du cache
+        
+        Returns:
+            tuple: (word_freq, total_words), ou None si la clé est absente
+        """
+        entry = self._read(key, full=True)
+        if entry is None:
+            return None
+        (total_words, _, _), word_freq = entry
+        return word_freq, total_words
+    
+    def get_top(self, key, n):
+        """
+        Relit l'en-tête d'une entrée, sans la table complète (sauf si n
+        dépasse TOP_CACHED)
+        
+        Returns:
+            tuple: (n mots les plus fréquents, nombre de mots uniques,
+            total_words), ou None si la clé est absente
+        """
+        entry = self._read(key, full=False)
+        if entry is None:
+            return None
+        total_words, unique_words, top = entry[0]
+        if n > len(top) and len(top) < unique_words:
+            top = top_words(self.get(key)[0], n)
+        return top[:n], unique_words, total_words
+    
+    def put(self, key, word_freq, total_words):
+        """Enregistre un résultat puis applique la politique d'éviction"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        header = marshal.dumps((total_words, len(word_freq), top_words(word_freq, TOP_CACHED)))
+        with open(tmp_path, 'wb') as f:
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            marshal.dump(dict(word_freq), f)
+        os.replace(tmp_path, path)
+        self.evict()
+    
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.bin'):
+                    stat = entry.stat()
+                    entries.append((stat.st_atime_ns, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -6,9 +6,18 @@ import os
 import sys
 import csv
 import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+import tracemalloc
 import statistics
 from datetime import datetime
-import subprocess
+from collections import defaultdict
+
+from WordCount import (CHUNK_SIZE, clean_word, top_words, read_chunks, count_stream,
+                       word_count_sequential, word_count_parallel, word_count_mmap)
 
 def get_system_info():
     """Récupère les informations système"""
@@ -28,88 +37,503 @@ def get_system_info():
     
     return info
 
-def run_wordcount(file_path, repetitions=5):
+def _run_sequential(file_path):
+    word_freq, total_words, _ = word_count_sequential(file_path)
+    return total_words, len(word_freq)
+
+def _run_parallel(file_path):
+    word_freq, total_words, _ = word_count_parallel(file_path, os.cpu_count())
+    return total_words, len(word_freq)
+
+def _run_mmap(file_path):
+    word_freq, total_words, _ = word_count_mmap(file_path)
+    return total_words, len(word_freq)
+
+def _run_stream(file_path):
+    with open(file_path, 'rb') as f:
+        word_freq, total_words, _ = count_stream(read_chunks(f))
+    return total_words, len(word_freq)
+
+def _run_approx(file_path):
+    from approx_count import word_count_approx
+    counter, total_words, _ = word_count_approx(file_path)
+    return total_words, len(counter.heavy_hitters)
+
+def _run_external(file_path):
+    from external_count import word_count_external
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        total_words, unique_words, _ = word_count_external(
+            file_path, os.path.join(tmp_dir, "counts.wcb"))
+    return total_words, unique_words
+
+def _run_compact(file_path):
+    from compact_counter import word_count_compact
+    word_freq, total_words, _ = word_count_compact(file_path)
+    return total_words, len(word_freq)
+
+# Moteurs de comptage comparés : chacun retourne (mots, mots uniques)
+ENGINES = {
+    "sequentiel": _run_sequential,
+    "parallele": _run_parallel,
+    "mmap": _run_mmap,
+    "flux": _run_stream,
+    "approx": _run_approx,
+    "externe": _run_external,
+    "compact": _run_compact,
+}
+
+def drop_file_cache(file_path):
+    """
+    Retire un fichier du cache de pages de l'OS (cache froid)
+    
+    Returns:
+        bool: False si la plateforme ne le permet pas (ex: Windows)
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+def warm_file_cache(file_path):
+    """Lit le fichier une fois pour le charger dans le cache de pages (cache chaud)"""
+    with open(file_path, 'rb') as f:
+        while f.read(16 * 1024 * 1024):
+            pass
+
+class PeakMemorySampler:
+    """
+    Échantillonne en tâche de fond le RSS d'un processus et de ses fils
+    
+    Contrairement à ru_maxrss, le pic est propre à chaque mesure et inclut
+    les processus fils (moteur parallèle).
+    
+    Args:
+        pid: Processus observé (défaut: processus courant)
+        interval: Secondes entre deux échantillons
+    """
+    
+    def __init__(self, pid=None, interval=0.005):
+        import psutil
+        self.interval = interval
+        self.peak_rss = 0
+        self._process = psutil.Process(pid)
+        self._errors = (psutil.NoSuchProcess, psutil.AccessDenied)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def _sample(self):
+        try:
+            rss = self._process.memory_info().rss
+            children = self._process.children(recursive=True)
+        except self._errors:
+            return
+        for child in children:
+            try:
+                rss += child.memory_info().rss
+            except self._errors:
+                pass
+        self.peak_rss = max(self.peak_rss, rss)
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def __enter__(self):
+        self._sample()
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+def _cpu_time():
+    """Temps CPU (utilisateur + système) du processus et de ses fils terminés"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+def measure_tracemalloc_peak(file_path, engine="sequentiel"):
+    """
+    Mesure le pic d'allocations Python d'un moteur avec tracemalloc
+    
+    Exécution séparée des mesures de temps (tracemalloc ralentit fortement
+    le comptage) ; les allocations des processus fils ne sont pas vues.
+    
+    Returns:
+        int: Pic d'allocations en octets
+    """
+    tracemalloc.start()
+    try:
+        ENGINES[engine](file_path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def measure_peak_rss(file_path, engine="sequentiel"):
+    """
+    Mesure le pic de RSS d'un moteur exécuté dans un interpréteur neuf
+    
+    Dans le processus du benchmark, le RSS garde le tas laissé par les
+    moteurs précédents ; un processus dédié par mesure rend les pics
+    comparables d'un moteur à l'autre (processus fils compris).
+    
+    Returns:
+        int: Pic de RSS en octets
+    """
+    code = f"import run_bench; run_bench.ENGINES[{engine!r}]({os.path.abspath(file_path)!r})"
+    process = subprocess.Popen([sys.executable, "-c", code],
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    with PeakMemorySampler(process.pid) as sampler:
+        if process.wait():
+            raise subprocess.CalledProcessError(process.returncode, code)
+    return sampler.peak_rss
+
+def run_wordcount(file_path, engine="sequentiel", repetitions=5, cold=False):
     """
-    Exécute le comptage de mots plusieurs fois
+    Exécute le comptage de mots plusieurs fois dans le processus courant
     
     Args:
         file_path: Chemin vers le fichier
+        engine: Nom du moteur de comptage (clé de ENGINES)
         repetitions: Nombre de répétitions
+        cold: Vide le cache de pages avant chaque répétition
     
     Returns:
         list: Temps d'exécution pour chaque répétition
+        list: Temps CPU (processus + fils) pour chaque répétition
+        int: Nombre total de mots
+        int: Nombre de mots uniques
     """
+    run = ENGINES[engine]
     times = []
+    cpu_times = []
+    
+    if not cold:
+        warm_file_cache(file_path)
     
     for i in range(repetitions):
-        print(f"  Exécution {i+1}/{repetitions}...", end='', flush=True)
+        print(f"  [{engine}, cache {'froid' if cold else 'chaud'}] "
+              f"Exécution {i+1}/{repetitions}...", end='', flush=True)
         
-        start_time = time.time()
+        if cold:
+            drop_file_cache(file_path)
         
-        result = subprocess.run(
-            [sys.executable, "word_count.py", file_path],
-            capture_output=True,
-            text=True
-        )
+        start_cpu = _cpu_time()
+        start_time = time.perf_counter()
+        total_words, unique_words = run(file_path)
+        end_time = time.perf_counter()
+        end_cpu = _cpu_time()
         
-        end_time = time.time()
         exec_time = end_time - start_time
         times.append(exec_time)
+        cpu_times.append(end_cpu - start_cpu)
         
         print(f" {exec_time:.3f}s")
     
-    return times
+    return times, cpu_times, total_words, unique_words
+
+def list_corpus_files(data_dir="data"):
+    """Liste les corpus du dossier, triés par taille croissante"""
+    files = [f for f in os.listdir(data_dir)
+             if f.startswith("corpus_") and f.endswith(".txt")]
+    files.sort(key=lambda f: os.path.getsize(os.path.join(data_dir, f)))
+    return files
 
-def benchmark_all_files(data_dir="data", repetitions=5):
+def benchmark_all_files(data_dir="data", repetitions=5, engines=None, cold=True):
     """
-    Exécute le benchmark sur tous les fichiers du dossier
+    Exécute le benchmark de chaque moteur sur tous les fichiers du dossier
+    
+    Args:
+        data_dir: Dossier des corpus
+        repetitions: Nombre de répétitions par mesure
+        engines: Moteurs à comparer (défaut: tous ceux de ENGINES)
+        cold: Mesure aussi le cache froid en plus du cache chaud
     
     Returns:
-        list: Résultats du benchmark
+        list: Résultats du benchmark, une ligne par (fichier, moteur, cache)
     """
-    files = []
-    for f in os.listdir(data_dir):
-        if f.startswith("corpus_") and f.endswith(".txt"):
-            files.append(f)
-    
-    files.sort(key=lambda x: int(x.split('_')[1].replace('MB.txt', '')))
+    engines = engines or list(ENGINES)
+    cold_supported = hasattr(os, 'posix_fadvise')
+    if cold and not cold_supported:
+        print("Cache froid non supporté sur cette plateforme : mesures à chaud uniquement")
+    modes = [True, False] if cold and cold_supported else [False]
     
     results = []
     
     print("Lancement des benchmarks WordCount")
     print("=" * 60)
     
-    for file_name in files:
+    for file_name in list_corpus_files(data_dir):
         file_path = os.path.join(data_dir, file_name)
-        file_size = os.path.getsize(file_path) / (1024 * 1024)
+        file_bytes = os.path.getsize(file_path)
+        file_size = file_bytes / (1024 * 1024)
         
         print(f"\nFichier: {file_name}")
         print(f"Taille: {file_size:.1f} MB")
         print("-" * 30)
         
-        exec_times = run_wordcount(file_path, repetitions)
-        
-        stats = {
-            "fichier": file_name,
-            "taille_mb": round(file_size, 2),
-            "taille_bytes": os.path.getsize(file_path),
-            "repetitions": repetitions,
-            "temps_min": min(exec_times),
-            "temps_max": max(exec_times),
-            "temps_moyen": statistics.mean(exec_times),
-            "temps_median": statistics.median(exec_times),
-            "ecart_type": statistics.stdev(exec_times) if len(exec_times) > 1 else 0,
-            "temps_total": sum(exec_times),
-            "temps_details": exec_times
-        }
-        
-        results.append(stats)
+        for engine in engines:
+            # Mémoire mesurée une fois par moteur (processus dédié, puis
+            # tracemalloc) : elle ne dépend pas du cache de pages
+            peak_rss_mb = measure_peak_rss(file_path, engine) / (1024 * 1024)
+            tracemalloc_peak_mb = measure_tracemalloc_peak(file_path, engine) / (1024 * 1024)
+            for is_cold in modes:
+                exec_times, cpu_times, total_words, unique_words = run_wordcount(
+                    file_path, engine, repetitions, is_cold)
+                
+                best_time = min(exec_times)
+                cpu_mean = statistics.mean(cpu_times)
+                stats = {
+                    "fichier": file_name,
+                    "moteur": engine,
+                    "cache": "froid" if is_cold else "chaud",
+                    "taille_mb": round(file_size, 2),
+                    "taille_bytes": file_bytes,
+                    "repetitions": repetitions,
+                    "temps_min": best_time,
+                    "temps_max": max(exec_times),
+                    "temps_moyen": statistics.mean(exec_times),
+                    "temps_median": statistics.median(exec_times),
+                    "ecart_type": statistics.stdev(exec_times) if len(exec_times) > 1 else 0,
+                    "temps_total": sum(exec_times),
+                    "mots": total_words,
+                    "mots_uniques": unique_words,
+                    "debit_mo_s": file_size / best_time if best_time > 0 else 0,
+                    "mots_par_s": total_words / best_time if best_time > 0 else 0,
+                    "temps_cpu_moyen": cpu_mean,
+                    "ratio_cpu_mur": cpu_mean / statistics.mean(exec_times) if best_time > 0 else 0,
+                    "rss_pic_mo": peak_rss_mb,
+                    "tracemalloc_pic_mo": tracemalloc_peak_mb,
+                    "temps_details": exec_times
+                }
+                
+                results.append(stats)
+                
+                print(f"  Moyenne: {stats['temps_moyen']:.3f}s - "
+                      f"{stats['debit_mo_s']:.1f} MB/s - {stats['mots_par_s']:,.0f} mots/s")
+                print(f"  CPU/mur: {stats['ratio_cpu_mur']:.2f} - RSS pic: {stats['rss_pic_mo']:.1f} Mo - "
+                      f"tracemalloc pic: {stats['tracemalloc_pic_mo']:.1f} Mo")
+    
+    return results
+
+def _word_count_per_word(file_path):
+    """Boucle de référence : clean_word appelé pour chaque mot"""
+    word_freq = defaultdict(int)
+    total_words = 0
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            for word in line.split():
+                cleaned_word = clean_word(word)
+                if cleaned_word:
+                    word_freq[cleaned_word] += 1
+                    total_words += 1
+    return dict(word_freq), total_words
+
+def benchmark_tokenizer(file_path, repetitions=3):
+    """
+    Compare le débit (mots/s) de la boucle clean_word mot par mot et du
+    tokeniseur en un seul passage de word_count_sequential
+    
+    Returns:
+        dict: Débits en mots/s et gain obtenu
+    """
+    legacy_times = []
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        legacy_freq, legacy_total = _word_count_per_word(file_path)
+        legacy_times.append(time.perf_counter() - start_time)
+    
+    fast_times = []
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        word_freq, total_words, _ = word_count_sequential(file_path)
+        fast_times.append(time.perf_counter() - start_time)
+    
+    if word_freq != legacy_freq or total_words != legacy_total:
+        raise AssertionError(f"Résultats différents entre les deux tokeniseurs pour {file_path}")
+    
+    legacy_rate = total_words / min(legacy_times) if min(legacy_times) > 0 else 0
+    fast_rate = total_words / min(fast_times) if min(fast_times) > 0 else 0
+    
+    return {
+        "fichier": os.path.basename(file_path),
+        "mots": total_words,
+        "mots_par_s_clean_word": legacy_rate,
+        "mots_par_s_tokenize": fast_rate,
+        "gain": fast_rate / legacy_rate if legacy_rate > 0 else 0
+    }
+
+def benchmark_phases(file_path, cold=False):
+    """
+    Répartit le temps d'un comptage séquentiel entre lecture, décodage,
+    tokenisation, comptage et top-K
+    
+    Args:
+        file_path: Chemin vers le fichier
+        cold: Vide le cache de pages avant la mesure
+    
+    Returns:
+        dict: Temps par phase (temps_<phase>) et limitation dominante (E/S ou CPU)
+    """
+    from profiling import PhaseTimer, word_count_profiled
+    
+    if cold:
+        drop_file_cache(file_path)
+    else:
+        warm_file_cache(file_path)
+    
+    timer = PhaseTimer()
+    word_freq, total_words, _ = word_count_profiled(file_path, timer)
+    with timer.phase('top_k'):
+        top_words(word_freq, 20)
+    
+    row = {"fichier": os.path.basename(file_path), "cache": "froid" if cold else "chaud"}
+    row.update(timer.as_dict())
+    row["mots"] = total_words
+    return row
+
+def default_worker_counts():
+    """Nombres de processus testés : 1, 2, 4... puis le nombre de cœurs"""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cores:
+        counts.append(counts[-1] * 2)
+    if cores > 1:
+        counts.append(cores)
+    return counts
+
+def _best_time(file_path, workers, repetitions):
+    """Meilleur temps (cache chaud) : séquentiel pour 1 processus, parallèle au-delà"""
+    warm_file_cache(file_path)
+    times = []
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        if workers == 1:
+            word_count_sequential(file_path)
+        else:
+            word_count_parallel(file_path, workers)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+def _scaling_row(kind, file_name, file_bytes, workers, best_time, speedup):
+    return {
+        "type": kind,
+        "fichier": file_name,
+        "taille_mb": round(file_bytes / (1024 * 1024), 2),
+        "workers": workers,
+        "temps_min": best_time,
+        "acceleration": speedup,
+        "efficacite": speedup / workers,
+        "debit_mo_s": file_bytes / (1024 * 1024) / best_time if best_time > 0 else 0,
+    }
+
+def benchmark_scaling(data_dir="data", worker_counts=None, repetitions=3):
+    """
+    Matrice de passage à l'échelle : tailles de corpus x nombres de processus
+    
+    - fort : taille fixe, accélération T(1) / T(p) et efficacité
+      accélération / p, pour chaque corpus ;
+    - faible : p fois le corpus de base (le plus petit d'au moins un bloc
+      de CHUNK_SIZE) pour p processus, efficacité T(1) / T(p).
+    
+    T(1) est le temps du moteur séquentiel, mesuré même si 1 ne fait pas
+    partie de worker_counts.
+    
+    Returns:
+        list: Une ligne par (type, fichier, nombre de processus)
+    """
+    worker_counts = worker_counts or default_worker_counts()
+    files = list_corpus_files(data_dir)
+    results = []
+    
+    print("\nPASSAGE À L'ÉCHELLE FORT (taille fixe)")
+    print("-" * 60)
+    for file_name in files:
+        file_path = os.path.join(data_dir, file_name)
+        file_bytes = os.path.getsize(file_path)
+        base_time = _best_time(file_path, 1, repetitions)
+        for workers in worker_counts:
+            best_time = base_time if workers == 1 else _best_time(file_path, workers, repetitions)
+            row = _scaling_row("fort", file_name, file_bytes, workers, best_time, base_time / best_time)
+            results.append(row)
+            print(f"  {file_name:<20} {workers:>3} processus: {best_time:.3f}s - "
+                  f"accélération {row['acceleration']:.2f} - efficacité {row['efficacite']:.0%}")
+    
+    if not files:
+        return results
+    sizes = [(os.path.getsize(os.path.join(data_dir, f)), f) for f in files]
+    large_enough = [entry for entry in sizes if entry[0] >= CHUNK_SIZE]
+    base_bytes, base_name = large_enough[0] if large_enough else sizes[-1]
+    base_path = os.path.join(data_dir, base_name)
+    
+    print(f"\nPASSAGE À L'ÉCHELLE FAIBLE ({base_name} par processus)")
+    print("-" * 60)
+    base_time = _best_time(base_path, 1, repetitions)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for workers in worker_counts:
+            if workers == 1:
+                file_bytes, best_time = base_bytes, base_time
+            else:
+                file_path = os.path.join(tmp_dir, f"faible_{workers}.txt")
+                with open(file_path, 'wb') as out:
+                    for _ in range(workers):
+                        with open(base_path, 'rb') as f:
+                            shutil.copyfileobj(f, out)
+                        out.write(b'\n')
+                file_bytes = os.path.getsize(file_path)
+                best_time = _best_time(file_path, workers, repetitions)
+                os.remove(file_path)
+            row = _scaling_row("faible", f"{workers} x {base_name}", file_bytes,
+                               workers, best_time, workers * base_time / best_time)
+            results.append(row)
+            print(f"  {workers:>3} processus, {row['taille_mb']:.1f} MB: {best_time:.3f}s - "
+                  f"efficacité {row['efficacite']:.0%}")
+    
+    return results
+
+def benchmark_approx(file_path, memory_budgets=(0.05, 0.25, 1, 4), k=20):
+    """
+    Mesure le compromis précision / mémoire du mode approximatif
+    
+    Args:
+        file_path: Chemin vers le fichier
+        memory_budgets: Plafonds mémoire testés en Mo
+        k: Taille du top comparé au comptage exact
+    
+    Returns:
+        list: Une ligne de résultats par plafond mémoire
+    """
+    from approx_count import word_count_approx
+    
+    word_freq, total_words, exact_time = word_count_sequential(file_path)
+    exact_top = top_words(word_freq, k)
+    exact_memory = sys.getsizeof(word_freq) + sum(sys.getsizeof(w) for w in word_freq)
+    
+    results = []
+    for memory_mb in memory_budgets:
+        counter, _, exec_time = word_count_approx(file_path, memory_mb)
+        approx_top = counter.top(k)
+        found = {word for word, _, _ in approx_top} & {word for word, _ in exact_top}
+        errors = [abs(counter.estimate(word) - freq) / freq for word, freq in exact_top]
         
-        print(f"\nRésumé pour {file_name}:")
-        print(f"  Moyenne: {stats['temps_moyen']:.3f}s")
-        print(f"  Min: {stats['temps_min']:.3f}s")
-        print(f"  Max: {stats['temps_max']:.3f}s")
-        print(f"  Écart-type: {stats['ecart_type']:.3f}s")
+        results.append({
+            "fichier": os.path.basename(file_path),
+            "memoire_mo": memory_mb,
+            "memoire_octets": counter.memory_bytes(),
+            "memoire_exacte_octets": exact_memory,
+            "rappel_top_k": len(found) / len(exact_top) if exact_top else 1,
+            "erreur_relative_moyenne": statistics.mean(errors) if errors else 0,
+            "erreur_relative_max": max(errors) if errors else 0,
+            "temps": exec_time,
+            "temps_exact": exact_time
+        })
     
     return results
 
@@ -119,9 +543,11 @@ def save_results_to_csv(results, system_info, output_file="results/benchmark_res
     
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
         fieldnames = [
-            'fichier', 'taille_mb', 'taille_bytes', 'repetitions',
+            'fichier', 'moteur', 'cache', 'taille_mb', 'taille_bytes', 'repetitions',
             'temps_min', 'temps_max', 'temps_moyen', 'temps_median',
-            'ecart_type', 'temps_total'
+            'ecart_type', 'temps_total', 'mots', 'mots_uniques',
+            'debit_mo_s', 'mots_par_s', 'temps_cpu_moyen', 'ratio_cpu_mur',
+            'rss_pic_mo', 'tracemalloc_pic_mo'
         ]
         
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -133,7 +559,7 @@ def save_results_to_csv(results, system_info, output_file="results/benchmark_res
     
     print(f"\nRésultats sauvegardés dans: {output_file}")
     
-    info_file = "results/system_info.txt"
+    info_file = os.path.join(os.path.dirname(output_file), "system_info.txt")
     with open(info_file, 'w', encoding='utf-8') as f:
         f.write("INFORMATIONS SYSTÈME\n")
         f.write("=" * 40 + "\n\n")
@@ -142,13 +568,188 @@ def save_results_to_csv(results, system_info, output_file="results/benchmark_res
     
     print(f"Informations système sauvegardées dans: {info_file}")
 
-def main():
+def save_phases_to_csv(rows, output_file="results/benchmark_phases.csv"):
+    """Sauvegarde la répartition du temps par phase en CSV"""
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(rows[0]) if rows else ['fichier'])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Répartition par phase sauvegardée dans: {output_file}")
+
+# Temps d'import maximal (ms, cumulé) des points d'entrée ; aucun ne doit
+# charger de dépendance lourde, réservées aux fonctions qui en ont besoin
+IMPORT_BUDGETS_MS = {
+    "cli": 50,
+    "WordCount": 50,
+    "gen_corpus": 50,
+    "plot_results": 50,
+    "run_bench": 100,
+    "wordcount_service": 150,
+}
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "psutil")
+# Comptage complet d'un petit fichier (python cli.py count) : temps total
+# maximal en ms, démarrage de l'interpréteur compris, et modules qu'un
+# comptage séquentiel ne doit pas charger
+COUNT_RUN_BUDGET_MS = 100
+COUNT_RUN_EXCLUDED = HEAVY_MODULES + ("multiprocessing", "concurrent")
+
+def _bytecode_env():
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+def _imported_modules(stderr):
+    """Modules et temps d'import cumulés (ms) lus dans la sortie de python -X importtime"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total_us, name = line.split("|")
+        if total_us.strip().isdigit():
+            imports[name.strip()] = int(total_us) / 1000
+    return imports
+
+def _loaded(imports, modules):
+    return sorted({name.split(".")[0] for name in imports} & set(modules))
+
+def measure_import_time(module, repetitions=3):
+    """
+    Mesure l'import d'un module avec python -X importtime, dans un
+    interpréteur neuf (bytecode en cache, meilleur de plusieurs essais)
+    
+    Returns:
+        float: Temps d'import cumulé en ms
+        list: Dépendances lourdes (HEAVY_MODULES) chargées par l'import
+    """
+    env = _bytecode_env()
+    best = None
+    heavy = set()
+    for attempt in range(repetitions + 1):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                                   capture_output=True, text=True, check=True)
+        imports = _imported_modules(completed.stderr)
+        heavy.update(_loaded(imports, HEAVY_MODULES))
+        cumulative = imports.get(module)
+        # Le premier essai écrit le bytecode et n'est pas retenu
+        if attempt and cumulative is not None:
+            best = cumulative if best is None else min(best, cumulative)
+    return best, sorted(heavy)
+
+def measure_count_run(repetitions=3):
+    """
+    Mesure un comptage complet (python cli.py count) d'un petit fichier
+    
+    Les imports faits à l'exécution (et non à l'import du module)
+    n'apparaissent que dans un vrai comptage : measure_import_time ne les
+    voit pas. Le comptage tourne dans un dossier temporaire (ses résultats
+    y sont écrits).
+    
+    Returns:
+        float: Temps total du processus en ms (meilleur des essais)
+        list: Modules exclus (COUNT_RUN_EXCLUDED) chargés par le comptage
+    """
+    env = _bytecode_env()
+    cli_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "demarrage.txt")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write("le temps de démarrage du comptage\n")
+        command = [sys.executable, cli_path, "count", file_path]
+        # Premier essai : bytecode écrit et modules chargés, non chronométré
+        completed = subprocess.run([sys.executable, "-X", "importtime", *command[1:]], cwd=tmp_dir, env=env,
+                                   capture_output=True, text=True, check=True)
+        excluded = _loaded(_imported_modules(completed.stderr), COUNT_RUN_EXCLUDED)
+        times = []
+        for _ in range(repetitions):
+            start_time = time.perf_counter()
+            subprocess.run(command, cwd=tmp_dir, env=env, capture_output=True, check=True)
+            times.append((time.perf_counter() - start_time) * 1000)
+    return min(times), excluded
+
+def check_startup(budgets=None):
+    """
+    Vérifie le temps de démarrage des points d'entrée (régressions d'import)
+    et celui d'un comptage complet par cli.py count
+    
+    Returns:
+        list: Une ligne par module, plus une pour le comptage (temps,
+        budget, dépendances lourdes, succès)
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    rows = []
+    for module, budget in budgets.items():
+        import_ms, heavy = measure_import_time(module)
+        rows.append({
+            "module": module,
+            "import_ms": import_ms,
+            "budget_ms": budget,
+            "dependances_lourdes": heavy,
+            "ok": not heavy and import_ms is not None and import_ms <= budget,
+        })
+    run_ms, excluded = measure_count_run()
+    rows.append({
+        "module": "cli.py count",
+        "import_ms": run_ms,
+        "budget_ms": COUNT_RUN_BUDGET_MS,
+        "dependances_lourdes": excluded,
+        "ok": not excluded and run_ms <= COUNT_RUN_BUDGET_MS,
+    })
+    return rows
+
+def print_startup(rows):
+    print("\nTEMPS DE DÉMARRAGE (python -X importtime ; cli.py count : comptage complet):")
+    print("-" * 72)
+    print(f"{'Module':<16} {'Temps (ms)':>12} {'Budget (ms)':>12} {'Dépendances lourdes':<20} {'État':>6}")
+    print("-" * 72)
+    for row in rows:
+        print(f"{row['module']:<16} {row['import_ms'] or 0:>12.1f} {row['budget_ms']:>12} "
+              f"{', '.join(row['dependances_lourdes']) or '-':<20} {'OK' if row['ok'] else 'ÉCHEC':>6}")
+
+def save_scaling_to_csv(rows, output_file="results/scaling_results.csv"):
+    """Sauvegarde la matrice de passage à l'échelle en CSV"""
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    fieldnames = ['type', 'fichier', 'taille_mb', 'workers', 'temps_min',
+                  'acceleration', 'efficacite', 'debit_mo_s']
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nPassage à l'échelle sauvegardé dans: {output_file}")
+
+def main(argv=None):
     """Fonction principale"""
-    print("BENCHMARK - Comptage de mots séquentiel")
+    parser = argparse.ArgumentParser(
+        description="Benchmark en processus des moteurs de comptage WordCount"
+    )
+    parser.add_argument('--data-dir', type=str, default='data',
+                       help='Dossier des corpus (défaut: data)')
+    parser.add_argument('--repetitions', type=int, default=5,
+                       help='Nombre de répétitions par mesure (défaut: 5)')
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES),
+                       help='Moteurs à comparer (défaut: tous)')
+    parser.add_argument('--no-cold', action='store_true',
+                       help='Ne mesure que le cache chaud')
+    parser.add_argument('--startup', action='store_true',
+                       help='Vérifie uniquement le temps d\'import des points d\'entrée (code de sortie 1 si régression)')
+    parser.add_argument('--scaling', action='store_true',
+                       help='Mesure uniquement le passage à l\'échelle (tailles x nombres de processus)')
+    parser.add_argument('--workers-list', type=int, nargs='+',
+                       help='Nombres de processus du mode --scaling (défaut: 1, 2, 4... nombre de cœurs)')
+    
+    args = parser.parse_args(argv)
+    
+    if args.startup:
+        rows = check_startup()
+        print_startup(rows)
+        sys.exit(0 if all(row['ok'] for row in rows) else 1)
+    
+    print("BENCHMARK - Comptage de mots")
     print("=" * 60)
     
-    if not os.path.exists("data"):
-        print("Erreur: Le dossier 'data/' n'existe pas.")
+    if not os.path.exists(args.data_dir):
+        print(f"Erreur: Le dossier '{args.data_dir}/' n'existe pas.")
         print("Exécute d'abord: python gen_corpus.py")
         sys.exit(1)
     
@@ -162,7 +763,12 @@ def main():
             print(f"{key}: {value}")
     print("=" * 40 + "\n")
     
-    results = benchmark_all_files(repetitions=5)
+    if args.scaling:
+        save_scaling_to_csv(benchmark_scaling(args.data_dir, args.workers_list, args.repetitions))
+        print("Graphiques: python plot_results.py")
+        return
+    
+    results = benchmark_all_files(args.data_dir, args.repetitions, args.engines, not args.no_cold)
     
     save_results_to_csv(results, system_info)
     
@@ -171,14 +777,51 @@ def main():
     print("=" * 60)
     
     print("\nRÉSUMÉ DES RÉSULTATS:")
+    print("-" * 96)
+    print(f"{'Fichier':<20} {'Moteur':<12} {'Cache':<6} {'Temps moyen (s)':>15} "
+          f"{'MB/s':>8} {'Mots/s':>12} {'CPU/mur':>8} {'RSS (Mo)':>9}")
+    print("-" * 96)
+    for result in results:
+        print(f"{result['fichier']:<20} {result['moteur']:<12} {result['cache']:<6} "
+              f"{result['temps_moyen']:>15.3f} {result['debit_mo_s']:>8.1f} {result['mots_par_s']:>12,.0f} "
+              f"{result['ratio_cpu_mur']:>8.2f} {result['rss_pic_mo']:>9.1f}")
+    
+    files = list_corpus_files(args.data_dir)
+    
+    print("\nTOKENISEUR (mots/s):")
     print("-" * 60)
-    print(f"{'Taille (MB)':<10} {'Temps moyen (s)':<15} {'Speedup':<10}")
+    print(f"{'Fichier':<20} {'clean_word':>12} {'tokenize':>12} {'Gain':>8}")
     print("-" * 60)
+    for file_name in files:
+        tok = benchmark_tokenizer(os.path.join(args.data_dir, file_name))
+        print(f"{tok['fichier']:<20} {tok['mots_par_s_clean_word']:>12,.0f} "
+              f"{tok['mots_par_s_tokenize']:>12,.0f} {tok['gain']:>7.1f}x")
     
-    base_time = results[0]['temps_moyen'] if results else 0
-    for result in results:
-        speedup = result['temps_moyen'] / base_time if base_time > 0 else 1
-        print(f"{result['taille_mb']:<10.1f} {result['temps_moyen']:<15.3f} {speedup:<10.2f}x")
+    print("\nRÉPARTITION PAR PHASE (séquentiel, secondes):")
+    print("-" * 96)
+    print(f"{'Fichier':<20} {'Cache':<6} {'Lecture':>9} {'Décodage':>9} {'Tokenis.':>9} "
+          f"{'Comptage':>9} {'Top-K':>9} {'Limité par':>11}")
+    print("-" * 96)
+    phase_rows = []
+    for file_name in files:
+        for is_cold in ([True, False] if not args.no_cold and hasattr(os, 'posix_fadvise') else [False]):
+            row = benchmark_phases(os.path.join(args.data_dir, file_name), is_cold)
+            phase_rows.append(row)
+            print(f"{row['fichier']:<20} {row['cache']:<6} {row['temps_lecture']:>9.4f} "
+                  f"{row['temps_decodage']:>9.4f} {row['temps_tokenisation']:>9.4f} "
+                  f"{row['temps_comptage']:>9.4f} {row['temps_top_k']:>9.4f} {row['limite_par']:>11}")
+    save_phases_to_csv(phase_rows)
+    
+    print("\nMODE APPROXIMATIF (précision / mémoire, top 20):")
+    print("-" * 60)
+    print(f"{'Fichier':<20} {'Mémoire (Mo)':>12} {'Rappel':>8} {'Err. moy.':>10} {'Temps (s)':>10}")
+    print("-" * 60)
+    for file_name in files:
+        for row in benchmark_approx(os.path.join(args.data_dir, file_name)):
+            print(f"{row['fichier']:<20} {row['memoire_octets'] / (1024 * 1024):>12.2f} "
+                  f"{row['rappel_top_k']:>8.0%} {row['erreur_relative_moyenne']:>10.2%} {row['temps']:>10.3f}")
+    
+    print_startup(check_startup())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
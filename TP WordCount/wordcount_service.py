@@ -0,0 +1,293 @@
+"""
+Service local de requêtes sur les tables de fréquences
+
+Les corpus enregistrés sont comptés une fois, dans un pool de processus
+(la boucle asyncio reste disponible pendant le comptage), puis gardés en
+mémoire sous forme d'index trié (voir prefix_index) : count, top, prefix et
+range sont des recherches dichotomiques. Une table .wcb déjà produite par
+WordCount.py --index se recharge avec son index .wcx, sans recompter ni retrier.
+
+API HTTP (réponses JSON) :
+    GET  /corpora                            corpus enregistrés et leur état
+    POST /corpora?name=<nom>&path=<fichier>  enregistre et compte un corpus (ou charge un .wcb)
+    GET  /count?corpus=<nom>&word=<mot>      fréquence d'un mot
+    GET  /top?corpus=<nom>&k=<k>[&p=<préf.>] k mots les plus fréquents (du préfixe)
+    GET  /prefix?corpus=<nom>&p=<préfixe>    mots commençant par le préfixe
+    GET  /range?corpus=<nom>&start=<a>&end=<b>  mots w tels que a <= w < b
+
+Exemple : python wordcount_service.py --corpus livre=data/corpus_1MB.txt
+          curl 'http://127.0.0.1:8765/top?corpus=livre&k=5'
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+
+from WordCount import tokenize, _count_file
+from count_format import EXTENSION, read_total_words
+from prefix_index import PrefixIndex
+
+MAX_RESULTS = 1000
+_STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+
+class ServiceError(Exception):
+    """Erreur de requête, renvoyée au client avec son code HTTP"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class Corpus:
+    """Index du vocabulaire d'un corpus et état de son chargement"""
+    
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.status = "en_cours"
+        self.error = None
+        self.index = PrefixIndex([], [])
+        self.total_words = 0
+        self.exec_time = 0
+    
+    def load(self, word_freq, total_words):
+        """Installe un résultat de comptage sous forme d'index trié"""
+        self.index = PrefixIndex.from_counts(word_freq)
+        self.total_words = total_words
+        self.status = "pret"
+    
+    def load_counts_file(self):
+        """Charge une table .wcb et son index .wcx"""
+        self.index = PrefixIndex.load(self.path)
+        self.total_words = read_total_words(self.path)
+        self.status = "pret"
+    
+    def describe(self):
+        return {
+            "nom": self.name,
+            "fichier": self.path,
+            "etat": self.status,
+            "erreur": self.error,
+            "mots": self.total_words,
+            "mots_uniques": len(self.index),
+            "temps_comptage": round(self.exec_time, 4),
+        }
+
+def _clean_query_word(word):
+    words = tokenize(word)
+    return words[0] if len(words) == 1 else None
+
+class WordCountService:
+    """
+    Registre des corpus et traitement des requêtes
+    
+    Args:
+        workers: Nombre de processus de comptage
+    """
+    
+    def __init__(self, workers=None):
+        self.corpora = {}
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self._jobs = set()
+    
+    def register(self, name, path):
+        """Enregistre un corpus et lance son comptage en tâche de fond"""
+        if name in self.corpora and self.corpora[name].status == "en_cours":
+            raise ServiceError(409, f"Corpus {name} déjà en cours de comptage")
+        if not os.path.isfile(path):
+            raise ServiceError(404, f"Fichier {path} non trouvé")
+        corpus = Corpus(name, path)
+        self.corpora[name] = corpus
+        job = asyncio.get_running_loop().create_task(self._count(corpus))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+        return corpus
+    
+    async def _count(self, corpus):
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+        try:
+            if corpus.path.endswith(EXTENSION):
+                await loop.run_in_executor(None, corpus.load_counts_file)
+            else:
+                word_freq, total_words = await loop.run_in_executor(self.executor, _count_file, corpus.path)
+                # Construction de l'index hors de la boucle d'événements
+                await loop.run_in_executor(None, corpus.load, word_freq, total_words)
+        except Exception as e:
+            corpus.status = "erreur"
+            corpus.error = str(e)
+        corpus.exec_time = time.time() - start_time
+    
+    def _corpus(self, params):
+        name = params.get("corpus")
+        if name not in self.corpora:
+            raise ServiceError(404, f"Corpus {name} inconnu")
+        corpus = self.corpora[name]
+        if corpus.status != "pret":
+            raise ServiceError(409, f"Corpus {name} non disponible ({corpus.status})")
+        return corpus
+    
+    def handle(self, method, path, params):
+        """
+        Traite une requête
+        
+        Returns:
+            int: Code HTTP
+            dict: Réponse JSON
+        """
+        if path == "/corpora":
+            if method == "GET":
+                return 200, {"corpus": [corpus.describe() for corpus in self.corpora.values()]}
+            if method == "POST":
+                if not params.get("name") or not params.get("path"):
+                    raise ServiceError(400, "Paramètres name et path requis")
+                return 202, self.register(params["name"], params["path"]).describe()
+            raise ServiceError(405, f"Méthode {method} non supportée")
+        
+        if method != "GET":
+            raise ServiceError(405, f"Méthode {method} non supportée")
+        
+        if path == "/count":
+            corpus = self._corpus(params)
+            word = _clean_query_word(params.get("word", ""))
+            return 200, {"mot": word, "frequence": corpus.index.get(word) if word else 0}
+        
+        if path == "/top":
+            corpus = self._corpus(params)
+            k = min(_int_param(params, "k", 10), MAX_RESULTS)
+            return 200, {"top": corpus.index.top(k, params.get("p", "").lower())}
+        
+        if path == "/prefix":
+            corpus = self._corpus(params)
+            limit = min(_int_param(params, "limit", 100), MAX_RESULTS)
+            return 200, {"mots": corpus.index.prefix(params.get("p", "").lower(), limit)}
+        
+        if path == "/range":
+            corpus = self._corpus(params)
+            limit = min(_int_param(params, "limit", 100), MAX_RESULTS)
+            return 200, {"mots": corpus.index.range(params.get("start"), params.get("end"), limit)}
+        
+        raise ServiceError(404, f"Chemin {path} inconnu")
+    
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+def _int_param(params, name, default):
+    """Paramètre entier positif ou nul (k, limit)"""
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ServiceError(400, f"Paramètre {name} entier attendu")
+    if value < 0:
+        raise ServiceError(400, f"Paramètre {name} positif ou nul attendu")
+    return value
+
+async def _read_request(reader):
+    """Lit une requête HTTP/1.1 ; None si la connexion est fermée"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, version = request_line.decode('latin-1').split(None, 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length:
+        await reader.readexactly(length)
+    keep_alive = (headers.get('connection', '').lower() != 'close'
+                  and version.strip().upper() != 'HTTP/1.0')
+    return method.upper(), target, keep_alive
+
+def serve_client(service):
+    """Fabrique le gestionnaire de connexion pour asyncio.start_server"""
+    
+    async def handle_client(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    request = None
+                if request is None:
+                    break
+                method, target, keep_alive = request
+                url = urlsplit(target)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    status, payload = service.handle(method, url.path, params)
+                except ServiceError as e:
+                    status, payload = e.status, {"erreur": str(e)}
+                
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    return handle_client
+
+async def run_service(host, port, socket_path=None, workers=None, corpora=()):
+    """Démarre le service (TCP ou socket Unix) et enregistre les corpus initiaux"""
+    service = WordCountService(workers)
+    for name, path in corpora:
+        service.register(name, path)
+    
+    if socket_path:
+        server = await asyncio.start_unix_server(serve_client(service), socket_path)
+        print(f"Service WordCount sur la socket {socket_path}")
+    else:
+        server = await asyncio.start_server(serve_client(service), host, port)
+        print(f"Service WordCount sur http://{host}:{port}")
+    
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv=None):
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Service de requêtes sur les comptages de mots")
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                       help='Adresse d\'écoute (défaut: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765,
+                       help='Port d\'écoute (défaut: 8765)')
+    parser.add_argument('--socket', type=str,
+                       help='Écoute sur une socket Unix au lieu de TCP')
+    parser.add_argument('--workers', type=int,
+                       help='Processus de comptage (défaut: nombre de cœurs)')
+    parser.add_argument('--corpus', action='append', default=[], metavar='NOM=FICHIER',
+                       help='Corpus à compter au démarrage (option répétable)')
+    
+    args = parser.parse_args(argv)
+    
+    corpora = []
+    for spec in args.corpus:
+        name, sep, path = spec.partition('=')
+        if not sep:
+            parser.error(f"--corpus attend NOM=FICHIER, reçu: {spec}")
+        corpora.append((name, path))
+    
+    try:
+        asyncio.run(run_service(args.host, args.port, args.socket, args.workers, corpora))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()